@@ -0,0 +1,99 @@
+import logging
+import os
+import pathlib
+import threading
+from typing import Callable, Dict, List
+
+from PieceFactory import PieceFactory
+
+log = logging.getLogger(__name__)
+
+
+class AssetWatcher:
+    """
+    Hot-reload of everything under `pieces/`.
+
+    A background thread polls file modification times (a portable stand-in
+    for inotify) and lets `PieceFactory.reload` rebuild whatever the changed
+    files feed.  The resulting swaps wait in `_pending` until the game loop
+    calls `apply`, so running games only ever see complete objects.
+
+    A file that fails to load is logged and keeps its old modification
+    time, so one caught mid-save is tried again on the next poll.
+    """
+
+    def __init__(self, factory: PieceFactory, interval_s: float = 0.5):
+        self.factory = factory
+        self.root = factory.pieces_root
+        self.interval_s = interval_s
+        self._mtimes: Dict[str, int] = self._scan()
+        self._pending: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _scan(self) -> Dict[str, int]:
+        mtimes, stack = {}, [str(self.root)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    else:
+                        mtimes[entry.path] = entry.stat().st_mtime_ns
+        return mtimes
+
+    def poll(self) -> List[pathlib.Path]:
+        """
+        Check once for added, changed or removed files and prepare their
+        reload; returns the files whose reload was prepared.
+        """
+        mtimes = self._scan()
+        changed = [p for p in mtimes.keys() | self._mtimes.keys()
+                   if mtimes.get(p) != self._mtimes.get(p)]
+        if not changed:
+            return []
+        failed = set()
+
+        def on_error(path: pathlib.Path, exc: Exception):
+            failed.add(str(path))
+            log.error("reloading %s failed, will retry: %s", path, exc)
+
+        swaps = self.factory.reload([pathlib.Path(p) for p in changed], on_error)
+        with self._lock:
+            self._pending.extend(swaps)
+        done = [p for p in changed if p not in failed]
+        for p in done:
+            if p in mtimes:
+                self._mtimes[p] = mtimes[p]
+            else:
+                self._mtimes.pop(p, None)
+        return [pathlib.Path(p) for p in done]
+
+    def apply(self) -> bool:
+        """Install prepared reloads; call from the game loop. True if any ran."""
+        if not self._pending:
+            return False
+        with self._lock:
+            swaps, self._pending = self._pending, []
+        for swap in swaps:
+            swap()
+        return True
+
+    # ─── background polling ─────────────────────────────────────────────────
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.poll()
+            except Exception:               # e.g. a file gone between scan and stat
+                log.exception("asset poll failed")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
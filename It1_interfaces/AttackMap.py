@@ -0,0 +1,134 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from Moves import Moves
+from Piece import Piece
+
+Cell = Tuple[int, int]
+
+# move-table tags of offsets that only move and never capture;
+# "1st" offsets are also only open from the piece's starting cell
+NON_CAPTURE = ("non_capture", "1st")
+
+
+class AttackMap:
+    """
+    Attacked squares and legal moves of every piece, kept up to date
+    incrementally.
+
+    Each piece's rays stop at the first occupied cell.  The cells a piece
+    "watches" (every cell its rays reach) are indexed, so when a cell's
+    occupant changes only the pieces watching it, plus the piece that
+    moved, are recomputed.  Per-colour attack counters make
+    `is_attacked` a single lookup.
+    """
+
+    def __init__(self, dims: Tuple[int, int], pieces: Dict[str, Piece]):
+        rows, cols = dims
+        self.dims = dims
+        self._pieces: Dict[str, Piece] = {}
+        self._state: Dict[str, Tuple[Cell, bool, Moves]] = {}  # pid -> (cell, can capture, rules)
+        self._occupants: Dict[Cell, Set[str]] = defaultdict(set)
+        self._attacks: Dict[str, Set[Cell]] = {}
+        self._moves: Dict[str, List[Cell]] = {}
+        self._watching: Dict[str, Set[Cell]] = {}
+        self._watchers: Dict[Cell, Set[str]] = defaultdict(set)
+        self._count = {color: [[0] * cols for _ in range(rows)] for color in ("W", "B")}
+        self.sync(pieces)
+
+    @staticmethod
+    def color_of(piece_id: str) -> str:
+        return piece_id.split("_")[0][-1]
+
+    # ─── queries ────────────────────────────────────────────────────────────
+    def is_attacked(self, cell: Cell, color: str) -> bool:
+        """Whether any piece of `color` attacks `cell`."""
+        r, c = cell
+        return self._count[color][r][c] > 0
+
+    def attackers(self, cell: Cell, color: str) -> int:
+        r, c = cell
+        return self._count[color][r][c]
+
+    def legal_moves(self, piece_id: str) -> List[Cell]:
+        return self._moves.get(piece_id, [])
+
+    def occupant(self, cell: Cell):
+        """The piece on `cell` (the lowest id if several share it), or None."""
+        others = self._occupants.get(cell)
+        return min(others) if others else None
+
+    # ─── maintenance ────────────────────────────────────────────────────────
+    def sync(self, pieces: Dict[str, Piece]):
+        """
+        Bring the map up to date with `pieces`: pieces that moved, were
+        captured, started/stopped being able to capture or got a new move
+        table (hot reload) are found by comparing with the last sync, and
+        only they and their watchers are recomputed.
+        """
+        dirty: Set[Cell] = set()
+        affected: Set[str] = set()
+
+        for pid in [pid for pid in self._state if pid not in pieces]:
+            cell = self._state.pop(pid)[0]
+            self._drop(pid)
+            self._pieces.pop(pid)
+            self._occupants[cell].discard(pid)
+            dirty.add(cell)
+
+        for pid, piece in pieces.items():
+            now = (tuple(piece.cell), piece._state._physics.can_capture(), piece._state._moves)
+            before = self._state.get(pid)
+            if now == before:
+                continue
+            self._state[pid] = now
+            self._pieces[pid] = piece
+            affected.add(pid)
+            if before is None or before[0] != now[0]:
+                if before is not None:
+                    self._occupants[before[0]].discard(pid)
+                    dirty.add(before[0])
+                self._occupants[now[0]].add(pid)
+                dirty.add(now[0])
+
+        for cell in dirty:
+            affected |= self._watchers.get(cell, set())
+        for pid in affected:
+            if pid in self._state:
+                self._recompute(pid)
+
+    def _drop(self, pid: str):
+        count = self._count[self.color_of(pid)]
+        for r, c in self._attacks.pop(pid, ()):
+            count[r][c] -= 1
+        for cell in self._watching.pop(pid, ()):
+            self._watchers[cell].discard(pid)
+        self._moves.pop(pid, None)
+
+    def _recompute(self, pid: str):
+        self._drop(pid)
+        (r, c), active, rules = self._state[pid]
+        color = self.color_of(pid)
+        at_home = self._pieces[pid].home == (r, c)
+        attacks, moves, watching = set(), [], set()
+        for ray in rules.get_rays(r, c):
+            for cell, tag in ray:
+                watching.add(cell)
+                capture_only, move_only = tag == "capture", tag in NON_CAPTURE
+                if not move_only and active:
+                    attacks.add(cell)
+                others = self._occupants.get(cell)
+                if not others:
+                    if not capture_only and (tag != "1st" or at_home):
+                        moves.append(cell)
+                    continue
+                if not move_only and any(self.color_of(o) != color for o in others):
+                    moves.append(cell)
+                break
+
+        count = self._count[color]
+        for ar, ac in attacks:
+            count[ar][ac] += 1
+        for cell in watching:
+            self._watchers[cell].add(pid)
+        self._attacks[pid], self._moves[pid], self._watching[pid] = attacks, moves, watching
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from img import Img
 
@@ -19,7 +19,20 @@ class Board:
     #     self.H_cells = H_cells
     #     self.img = img
 
+    def to_cell(self, square) -> tuple[int, int]:
+        """(row, col) of a square given as a cell or in algebraic form ("e2")."""
+        if isinstance(square, str):
+            return self.H_cells - int(square[1:]), ord(square[0].lower()) - ord("a")
+        return tuple(square)
+
+    def to_square(self, cell: tuple[int, int]) -> str:
+        """Algebraic name ("e2") of a (row, col) cell; inverse of `to_cell`."""
+        r, c = cell
+        return f"{chr(ord('a') + c)}{self.H_cells - r}"
+
     # convenience, not required by dataclass
     def clone(self) -> "Board":
         """Clone the board with a copy of the image."""
-        pass
\ No newline at end of file
+        img = Img()
+        img.img = self.img.img.copy()
+        return replace(self, img=img)
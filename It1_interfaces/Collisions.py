@@ -0,0 +1,147 @@
+"""
+Swept collision detection between pieces, in cell units.
+
+Every piece's position over a step is a chain of time-parameterised
+segments (`Path`): it stands at its start until the first segment
+begins, moves linearly along each one, and stays at the end of the last.
+Two pieces touch while their centres are less than `CONTACT` cells apart
+on both axes, by more than `OVERLAP` cells: a diagonal mover grazing its
+orthogonal neighbours at exactly `CONTACT` never touches them.
+
+Contact times are solved exactly from the segments themselves, never
+from where a step happens to start or end, so the same moves give the
+same contacts at any step size.  A contact belongs to the step in which
+it starts.  A sweep-and-prune pass over the pieces' bounding boxes for
+the step keeps the number of pairs solved close to the number that can
+actually meet.
+"""
+from typing import Dict, List, Optional, Tuple
+
+Cell = Tuple[float, float]
+Segment = Tuple[int, Cell, int, Cell]       # t0, cell at t0, t1, cell at t1
+Motion = Tuple[float, float, float, Cell, Cell]   # from, to, anchor t, cell at anchor, velocity
+
+CONTACT = 0.5       # centre distance (cells, per axis) below which pieces touch
+OVERLAP = 1e-6      # how far inside CONTACT they must get; absorbs float rounding
+
+_INF = float("inf")
+
+
+class Path:
+    __slots__ = ("rest", "segments")
+
+    def __init__(self, rest: Cell, segments: Optional[List[Segment]] = None):
+        """Position over time: `rest` when there are no `segments`."""
+        self.rest = rest
+        self.segments = sorted(segments or [])
+
+    def moving_since(self, t: float) -> Optional[int]:
+        """Start time of the segment being travelled at `t` (None = standing)."""
+        for t0, _, t1, _ in self.segments:
+            if t0 <= t < t1:
+                return t0
+        return None
+
+    def at(self, t: float) -> Cell:
+        pos = self.segments[0][1] if self.segments else self.rest
+        for t0, p0, t1, p1 in self.segments:
+            if t < t0:
+                break
+            if t >= t1:
+                pos = p1
+                continue
+            f = (t - t0) / (t1 - t0)
+            return p0[0] + (p1[0] - p0[0]) * f, p0[1] + (p1[1] - p0[1]) * f
+        return pos
+
+    def bounds(self, t_from: float, t_to: float) -> Tuple[float, float, float, float]:
+        """(min row, max row, min col, max col) covered during [t_from, t_to]."""
+        pts = [self.at(t) for t in (t_from, t_to, *self.breaks(t_from, t_to))]
+        rows, cols = [p[0] for p in pts], [p[1] for p in pts]
+        return min(rows), max(rows), min(cols), max(cols)
+
+    def breaks(self, t_from: float, t_to: float) -> List[float]:
+        return [t for seg in self.segments for t in (seg[0], seg[2]) if t_from < t < t_to]
+
+    def motions(self) -> List[Motion]:
+        """
+        The path as linear pieces covering all time: standing before,
+        between and after the segments, moving along each.
+        """
+        if not self.segments:
+            return [(-_INF, _INF, 0.0, self.rest, (0.0, 0.0))]
+        out, t_prev, p_prev = [], -_INF, self.segments[0][1]
+        for t0, p0, t1, p1 in self.segments:
+            if t0 > t_prev:
+                out.append((t_prev, t0, 0.0, p_prev, (0.0, 0.0)))
+            span = t1 - t0
+            out.append((t0, t1, t0, p0, ((p1[0] - p0[0]) / span, (p1[1] - p0[1]) / span)))
+            t_prev, p_prev = t1, p1
+        out.append((t_prev, _INF, 0.0, p_prev, (0.0, 0.0)))
+        return out
+
+
+def _axis_window(d: float, k: float, s: float, e: float) -> Optional[Tuple[float, float]]:
+    """Open sub-interval of (s, e) where |d + k * t| < CONTACT - OVERLAP (None if empty)."""
+    reach = CONTACT - OVERLAP
+    if k == 0:
+        return (s, e) if abs(d) < reach else None
+    a, b = (-reach - d) / k, (reach - d) / k
+    lo, hi = max(min(a, b), s), min(max(a, b), e)
+    return (lo, hi) if lo < hi else None
+
+
+def _windows(a: Path, b: Path) -> List[Tuple[float, float]]:
+    """Every time interval during which `a` and `b` touch, merged and in order."""
+    found = []
+    for a_from, a_to, a_t, (ar, ac), (avr, avc) in a.motions():
+        for b_from, b_to, b_t, (br, bc), (bvr, bvc) in b.motions():
+            s, e = max(a_from, b_from), min(a_to, b_to)
+            if s >= e:
+                continue
+            # relative position on each axis as d + k * t
+            wr = _axis_window(ar - avr * a_t - br + bvr * b_t, avr - bvr, s, e)
+            wc = wr and _axis_window(ac - avc * a_t - bc + bvc * b_t, avc - bvc, s, e)
+            if wr and wc and max(wr[0], wc[0]) < min(wr[1], wc[1]):
+                found.append((max(wr[0], wc[0]), min(wr[1], wc[1])))
+    found.sort()
+    merged = []
+    for lo, hi in found:
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def contacts(a: Path, b: Path, t_from: float, t_to: float) -> List[float]:
+    """Times in (t_from, t_to] at which `a` and `b` start touching."""
+    return [lo for lo, _ in _windows(a, b) if t_from < lo <= t_to]
+
+
+def sweep(paths: Dict[str, Path], t_from: float, t_to: float) -> List[Tuple[float, str, str]]:
+    """
+    Every time a pair starts touching during (t_from, t_to], as
+    (time, id, id) in time order.  Pairs where neither piece moves are
+    skipped: resting pieces never start touching by themselves.
+    """
+    boxes = []
+    for pid, path in paths.items():
+        r0, r1, c0, c1 = path.bounds(t_from, t_to)
+        boxes.append((c0 - CONTACT, c1 + CONTACT, r0 - CONTACT, r1 + CONTACT, pid))
+    boxes.sort()
+
+    hits, active = [], []
+    for c0, c1, r0, r1, pid in boxes:
+        active = [box for box in active if box[1] > c0]
+        for _, _, or0, or1, other in active:
+            if or0 >= r1 or r0 >= or1:
+                continue
+            a, b = paths[pid], paths[other]
+            if not (a.segments or b.segments):
+                continue
+            for t in contacts(a, b, t_from, t_to):
+                hits.append((t, *sorted((pid, other))))
+        active.append((c0, c1, r0, r1, pid))
+    hits.sort()
+    return hits
@@ -1,9 +1,145 @@
-from dataclasses import dataclass, field
+import struct
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 
-@dataclass
+
+# ─── compact encoding helpers ───────────────────────────────────────────
+NO_SQUARE = 0xFF
+
+
+@lru_cache(maxsize=None)
+def square_code(square: str) -> int:
+    """"e2" -> one byte: file in the low nibble, rank - 1 in the high one."""
+    file, rank = ord(square[0].lower()) - ord("a"), int(square[1:]) - 1
+    if not (0 <= file < 16 and 0 <= rank < 15):
+        raise ValueError(f"Square out of range: {square!r}")
+    return rank << 4 | file
+
+
+@lru_cache(maxsize=None)
+def square_name(code: int) -> str:
+    """Inverse of `square_code`."""
+    return f"{chr(ord('a') + (code & 0xF))}{(code >> 4) + 1}"
+
+
+class Interner:
+    """Two-way table between names and small ints (0, 1, 2, …)."""
+
+    def __init__(self, names=()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code: int) -> str:
+        return self.names[code]
+
+
+PIECE_IDS = Interner()
+COMMAND_TYPES = Interner(["Move", "Jump"])
+
+# timestamp, piece code, type code, src square, dst square
+RECORD_STRUCT = struct.Struct("<qHBBB")
+
+
 class Command:
-    timestamp: int          # ms since game start
-    piece_id: str
-    type: str               # "Move" | "Jump" | …
-    params: List            # payload (e.g. ["e2", "e4"]) 
\ No newline at end of file
+    """
+    One input or state event.
+
+    Same fields as before (`timestamp`, `piece_id`, `type`, `params`), but
+    piece ids and types are stored as `PIECE_IDS` / `COMMAND_TYPES` codes,
+    and commands built from encoded records (`from_codes`, `from_bytes`)
+    keep their squares as bytes until `params` is first read.
+
+    Encoded commands only make sense to a reader with the same interning
+    tables, so logs and peers must share `PIECE_IDS.names`.
+    """
+
+    __slots__ = ("timestamp", "piece_code", "type_code", "_params", "_squares")
+
+    def __init__(self, timestamp: int, piece_id: str, type: str, params: List):
+        self.timestamp = timestamp          # ms since game start
+        self.piece_code = PIECE_IDS.code(piece_id)
+        self.type_code = COMMAND_TYPES.code(type)   # "Move" | "Jump" | …
+        self._params = params               # payload (e.g. ["e2", "e4"])
+        self._squares: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def from_codes(cls, timestamp: int, piece_code: int, type_code: int,
+                   src: int = NO_SQUARE, dst: int = NO_SQUARE) -> "Command":
+        """Build a command straight from an encoded record, no string work."""
+        cmd = cls.__new__(cls)
+        cmd.timestamp = timestamp
+        cmd.piece_code = piece_code
+        cmd.type_code = type_code
+        cmd._params = None
+        cmd._squares = (src, dst)
+        return cmd
+
+    @classmethod
+    def from_bytes(cls, buf, offset: int = 0) -> "Command":
+        """Inverse of `to_bytes`."""
+        return cls.from_codes(*RECORD_STRUCT.unpack_from(buf, offset))
+
+    def to_bytes(self) -> bytes:
+        """`RECORD_STRUCT.size` bytes; params must be at most two squares."""
+        return RECORD_STRUCT.pack(self.timestamp, self.piece_code, self.type_code,
+                                  *self.squares())
+
+    def squares(self) -> Tuple[int, int]:
+        """(src, dst) square codes; a single param is stored as dst."""
+        if self._squares is None:
+            params = self._params
+            if len(params) > 2:
+                raise ValueError(f"Cannot encode params {params!r}")
+            src = square_code(params[0]) if len(params) > 1 else NO_SQUARE
+            dst = square_code(params[-1]) if params else NO_SQUARE
+            self._squares = (src, dst)
+        return self._squares
+
+    # ─── dataclass-compatible fields ────────────────────────────────────────
+    @property
+    def piece_id(self) -> str:
+        return PIECE_IDS.names[self.piece_code]
+
+    @piece_id.setter
+    def piece_id(self, value: str):
+        self.piece_code = PIECE_IDS.code(value)
+
+    @property
+    def type(self) -> str:
+        return COMMAND_TYPES.names[self.type_code]
+
+    @type.setter
+    def type(self, value: str):
+        self.type_code = COMMAND_TYPES.code(value)
+
+    @property
+    def params(self) -> List:
+        if self._params is None:
+            self._params = [square_name(s) for s in self._squares if s != NO_SQUARE]
+        return self._params
+
+    @params.setter
+    def params(self, value: List):
+        self._params = value
+        self._squares = None
+
+    def __eq__(self, other):
+        if not isinstance(other, Command):
+            return NotImplemented
+        return (self.timestamp, self.piece_code, self.type_code, self.params) == \
+               (other.timestamp, other.piece_code, other.type_code, other.params)
+
+    __hash__ = None     # mutable, like the dataclass it replaces
+
+    def __repr__(self):
+        return (f"Command(timestamp={self.timestamp!r}, piece_id={self.piece_id!r}, "
+                f"type={self.type!r}, params={self.params!r})")
@@ -0,0 +1,129 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from Command import (Command, COMMAND_TYPES, NO_SQUARE, PIECE_IDS, RECORD_STRUCT,
+                     square_code)
+
+
+# one fixed-width record per command
+RECORD = np.dtype([("timestamp", "<i8"),
+                   ("piece", "<u2"),     # PIECE_IDS code
+                   ("type", "u1"),       # COMMAND_TYPES code
+                   ("src", "u1"),        # square_code, NO_SQUARE if absent
+                   ("dst", "u1")])
+assert RECORD.itemsize == RECORD_STRUCT.size
+
+
+class CommandRing:
+    """
+    Bounded single-producer / single-consumer command queue.
+
+    Records live in a preallocated array of `capacity` slots.  The producer
+    only ever writes `_tail` and the consumer only `_head`, so neither side
+    takes a lock.  When the ring is full, `overflow` decides what `put` does:
+    "drop" refuses the command (counted in `dropped`), "block" waits for the
+    consumer to make room.
+    """
+
+    def __init__(self, capacity: int = 4096, overflow: str = "drop"):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+        self._mask = capacity - 1
+        self._mem = bytearray(capacity * RECORD.itemsize)
+        self._buf = np.frombuffer(self._mem, RECORD)     # view for draining
+        self._head = 0      # next record to read  (consumer side)
+        self._tail = 0      # next record to write (producer side)
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+    # ─── producer ───────────────────────────────────────────────────────────
+    def put(self, cmd: Command) -> bool:
+        """Encode and enqueue `cmd`; False if it was dropped on overflow."""
+        return self.put_record(cmd.timestamp, cmd.piece_code, cmd.type_code,
+                               *cmd.squares())
+
+    def put_record(self, timestamp: int, piece: int, type_code: int,
+                   src: int = NO_SQUARE, dst: int = NO_SQUARE) -> bool:
+        """Enqueue an already encoded command."""
+        tail = self._tail
+        while tail - self._head >= self.capacity:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return False
+            time.sleep(0)
+        RECORD_STRUCT.pack_into(self._mem, (tail & self._mask) * RECORD.itemsize,
+                        timestamp, piece, type_code, src, dst)
+        self._tail = tail + 1     # publish only after the record is written
+        return True
+
+    # ─── consumer ───────────────────────────────────────────────────────────
+    def drain_records(self, max_n: Optional[int] = None) -> np.ndarray:
+        """Dequeue up to `max_n` (default: all) records as a RECORD array."""
+        head, tail = self._head, self._tail
+        if max_n is not None:
+            tail = min(tail, head + max_n)
+        lo, hi = head & self._mask, tail & self._mask
+        if tail == head:
+            out = self._buf[:0].copy()
+        elif lo < hi:
+            out = self._buf[lo:hi].copy()
+        else:
+            out = np.concatenate((self._buf[lo:], self._buf[:hi]))
+        self._head = tail
+        return out
+
+    def drain(self, max_n: Optional[int] = None) -> List[Command]:
+        """Dequeue up to `max_n` (default: all) commands."""
+        return [Command.from_codes(*rec) for rec in self.drain_records(max_n).tolist()]
+
+
+def _bench(n: int = 200_000, batch: int = 64):
+    """Enqueue `n` commands in bursts of `batch` and drain them after each burst."""
+    import queue
+
+    cmds = [Command(i, f"P{i % 32}", "Move", ["e2", "e4"]) for i in range(n)]
+    src, dst, move = square_code("e2"), square_code("e4"), COMMAND_TYPES.code("Move")
+    records = [(i, PIECE_IDS.code(f"P{i % 32}"), move, src, dst) for i in range(n)]
+
+    q = queue.Queue()
+    t = time.perf_counter()
+    for i in range(0, n, batch):
+        for cmd in cmds[i:i + batch]:
+            q.put(cmd)
+        while not q.empty():
+            q.get()
+    t_queue = time.perf_counter() - t
+
+    ring = CommandRing()
+    t = time.perf_counter()
+    for i in range(0, n, batch):
+        for cmd in cmds[i:i + batch]:
+            ring.put(cmd)
+        ring.drain()
+    t_ring = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for i in range(0, n, batch):
+        for rec in records[i:i + batch]:
+            ring.put_record(*rec)
+        ring.drain_records()
+    t_records = time.perf_counter() - t
+
+    print(f"queue.Queue            : {n / t_queue:>12,.0f} commands/s")
+    print(f"CommandRing (Command)  : {n / t_ring:>12,.0f} commands/s")
+    print(f"CommandRing (records)  : {n / t_records:>12,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    _bench()
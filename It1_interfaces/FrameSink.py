@@ -0,0 +1,221 @@
+"""
+Where `Game._show` sends finished frames.
+
+`WindowSink` is the local `cv2.imshow` window.  `StreamSink` encodes
+frames on a worker thread and hands the bytes to any writer (a socket's
+`sendall`, a file's `write`), so a headless server can host games that a
+lightweight viewer displays elsewhere; `read_frames` is that viewer's side.
+
+Stream format: every message is a header and a list of tiles, each an
+encoded image placed at (x, y) on the previous picture.  A keyframe is
+one tile covering the whole frame; with `tile` set the other frames only
+carry the tiles that changed.
+"""
+import queue
+import struct
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from img import Img, cv2
+
+
+HEADER = struct.Struct("<IIHHH")     # total length, frame number, width, height, tiles
+TILE = struct.Struct("<HHI")         # x, y, encoded length
+
+
+class FrameSink:
+    """Interface: `show` is called by the game loop once per frame."""
+
+    def show(self, img: Img, wait_ms: int = 1) -> bool:
+        """
+        Output `img`, then handle viewer events for at most `wait_ms`;
+        False when the viewer asked to stop.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(FrameSink):
+    """Discards every frame: headless games, tests and benchmarks."""
+
+    def show(self, img: Img, wait_ms: int = 1) -> bool:
+        return True
+
+
+class WindowSink(FrameSink):
+    def __init__(self, title: str = "KungFu Chess",
+                 on_click: Optional[Callable[[int, int], None]] = None,
+                 on_key: Optional[Callable[[int], None]] = None):
+        """
+        Local OpenCV window; Esc or closing the window stops the game.
+
+        Left clicks go to `on_click(x, y)` and other keys to `on_key(key)`,
+        both called on the game-loop thread while `show` pumps events.
+        """
+        self.title = title
+        self.on_click = on_click
+        self.on_key = on_key
+        self._opened = False
+
+    def show(self, img: Img, wait_ms: int = 1) -> bool:
+        cv2.imshow(self.title, img.img)
+        if not self._opened:
+            cv2.setMouseCallback(self.title, self._mouse)
+            self._opened = True
+        key = cv2.waitKey(max(1, wait_ms))      # returns early on a key press
+        if key == 27:
+            return False
+        if key != -1 and self.on_key is not None:
+            self.on_key(key & 0xFF)
+        return cv2.getWindowProperty(self.title, cv2.WND_PROP_VISIBLE) >= 1
+
+    def _mouse(self, event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN and self.on_click is not None:
+            self.on_click(x, y)
+
+    def close(self):
+        if self._opened:                # destroying a window never shown raises
+            cv2.destroyWindow(self.title)
+            self._opened = False
+
+
+class StreamSink(FrameSink):
+    def __init__(self, write: Callable[[bytes], object], codec: str = "jpg",
+                 quality: int = 85, tile: Optional[int] = None,
+                 keyframe_every: int = 120, backlog: int = 2):
+        """
+        Encode frames as `codec` ("jpg" or "png") and pass each message to
+        `write`.  With `tile` set, frames are sent as the `tile`-pixel
+        squares that changed, and a whole frame every `keyframe_every`.
+
+        `show` only queues the frame; when `backlog` frames are already
+        waiting the oldest is dropped, so a slow writer never stalls the
+        game.  Frames are kept by reference: the caller must not draw on
+        a frame after showing it (`Game` draws every frame on a fresh copy
+        of the board).
+        """
+        self.write = write
+        self.ext = "." + codec
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality] if codec == "jpg" else []
+        self.tile = tile
+        self.keyframe_every = keyframe_every
+        self.stats = {"frames": 0, "dropped": 0, "bytes": 0, "encode_ms": 0.0}
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(backlog)
+        self._last_shown = None
+        self._prev: Optional[np.ndarray] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def show(self, img: Img, wait_ms: int = 1) -> bool:
+        if img.img is self._last_shown:          # frame not redrawn: nothing new
+            return True
+        self._last_shown = img.img
+        while True:
+            try:
+                self._queue.put_nowait(img.img)
+                return True
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.stats["dropped"] += 1
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    # ─── worker thread ──────────────────────────────────────────────────────
+    def _run(self):
+        while (frame := self._queue.get()) is not None:
+            t = time.perf_counter()
+            msg = self._encode(frame)
+            self.stats["encode_ms"] += (time.perf_counter() - t) * 1000
+            if msg is None:
+                continue
+            self.write(msg)
+            self.stats["bytes"] += len(msg)
+
+    def _encode(self, frame: np.ndarray) -> Optional[bytes]:
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        h, w = frame.shape[:2]
+        n = self.stats["frames"]
+        key = (self.tile is None or self._prev is None or self._prev.shape != frame.shape
+               or n % self.keyframe_every == 0)
+        rects = [(0, 0, w, h)] if key else self._changed_tiles(frame)
+        self._prev = frame
+        if not rects:
+            return None
+
+        body = []
+        for x, y, tw, th in rects:
+            ok, data = cv2.imencode(self.ext, frame[y:y + th, x:x + tw], self.params)
+            body += [TILE.pack(x, y, len(data)), data.tobytes()]
+        body = b"".join(body)
+        self.stats["frames"] += 1
+        return HEADER.pack(HEADER.size + len(body), n, w, h, len(rects)) + body
+
+    def _changed_tiles(self, frame: np.ndarray):
+        t = self.tile
+        h, w = frame.shape[:2]
+        diff = (frame != self._prev).reshape(h, w, -1).any(axis=2)
+        gh, gw = -(-h // t), -(-w // t)
+        padded = np.zeros((gh * t, gw * t), bool)
+        padded[:h, :w] = diff
+        changed = padded.reshape(gh, t, gw, t).any(axis=(1, 3))
+        return [(c * t, r * t, min(t, w - c * t), min(t, h - r * t))
+                for r, c in zip(*np.nonzero(changed))]
+
+
+# ─── viewer side ──────────────────────────────────────────────────────────
+def read_frames(read: Callable[[int], bytes]) -> Iterator[np.ndarray]:
+    """
+    Rebuild the frames of a `StreamSink` stream; `read(n)` returns up to
+    `n` bytes (a file's `read`, a socket's `recv`), b"" at the end.
+    The same array is updated and yielded each time.
+    """
+    buf, picture = bytearray(), None
+    while True:
+        while len(buf) >= HEADER.size and len(buf) >= HEADER.unpack_from(buf)[0]:
+            length, _, w, h, n_tiles = HEADER.unpack_from(buf)
+            if picture is None or picture.shape[:2] != (h, w):
+                picture = np.zeros((h, w, 3), np.uint8)
+            off = HEADER.size
+            for _ in range(n_tiles):
+                x, y, size = TILE.unpack_from(buf, off)
+                off += TILE.size
+                data = np.frombuffer(bytes(buf[off:off + size]), np.uint8)
+                tile = cv2.imdecode(data, cv2.IMREAD_COLOR)
+                picture[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+                off += size
+            del buf[:length]
+            yield picture
+        chunk = read(1 << 16)
+        if not chunk:
+            return
+        buf += chunk
+
+
+if __name__ == "__main__":
+    import argparse
+    import socket
+
+    parser = argparse.ArgumentParser(description="View a StreamSink stream.")
+    parser.add_argument("source", help="file path, or host:port to connect to")
+    args = parser.parse_args()
+    if ":" in args.source:
+        host, port = args.source.rsplit(":", 1)
+        read = socket.create_connection((host, int(port))).recv
+    else:
+        read = open(args.source, "rb").read
+    for picture in read_frames(read):
+        cv2.imshow("KungFu Chess (remote)", picture)
+        if cv2.waitKey(1) == 27:
+            break
+    cv2.destroyAllWindows()
@@ -1,26 +1,97 @@
-import inspect
-import pathlib
-import queue, threading, time, cv2, math
-from typing import List, Dict, Tuple, Optional
+from __future__ import annotations
+
+import hashlib
+import statistics
+import time
+from bisect import bisect_right
+from collections import deque
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
 from Board   import Board
 from Command import Command
+from CommandRing import CommandRing
 from Piece   import Piece
+from AttackMap import AttackMap
+from Collisions import Path, sweep
+from Material import EndRules, Material
+from FrameSink import FrameSink, WindowSink
 from img     import Img
 
+if TYPE_CHECKING:       # optional subsystems: headless runs that skip them never import them
+    from AssetWatcher import AssetWatcher
+    from Memory import MemoryBudget
+    from Recorder import Recorder
+    from Spectator import SpectatorFeed
+
+
+INPUT_POLL_MS = 10     # longest the window may wait for events between loop passes
+
 
 class InvalidBoard(Exception): ...
 # ────────────────────────────────────────────────────────────────────
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
-        """Initialize the game with pieces, board, and optional event bus."""
+    def __init__(self, pieces: List[Piece], board: Board,
+                 recorder: Optional[Recorder] = None,
+                 assets: Optional[AssetWatcher] = None,
+                 tick_ms: Optional[int] = None,
+                 spectators: Optional[SpectatorFeed] = None,
+                 rules: Optional[EndRules] = None,
+                 sink: Optional[FrameSink] = None,
+                 rollback_ms: int = 200,
+                 budget: Optional[MemoryBudget] = None):
+        """
+        Initialize the game with pieces, board, and optional event bus.
+
+        With `tick_ms` set the simulation runs in fixed steps of that many
+        game milliseconds (see `advance`), so the same command stream gives
+        the same `state_hash` on every machine; otherwise it steps once per
+        rendered frame on the wall clock.  In fixed-step mode the last
+        `rollback_ms` of ticks are kept as snapshots, so commands that
+        arrive late are still applied at their own tick (see `advance`).
+        With `budget` set, memory is checked while running and caches and
+        logs are trimmed when it is exceeded (see `Memory`).
+        """
         self.board: Board = board
-        self.user_input_queue: queue.Queue[Command] = queue.Queue()
+        self.recorder = recorder    # gets a frame every 1000/fps game ms when set
+        self.assets = assets        # hot-reloads pieces/ when set
+        self.tick_ms = tick_ms      # fixed-timestep mode when set
+        self.spectators = spectators  # gets the piece views every frame when set
+        self.sink = sink if sink is not None else WindowSink()   # where frames are shown
+        self.budget = budget        # trims caches and logs when set
+        self.sim_ms = 0             # game time of the last fixed tick
+        self._held: List[Command] = []   # stamped for a tick not reached yet
+        self._history = deque(maxlen=rollback_ms // tick_ms + 2) \
+            if tick_ms and rollback_ms else None  # (tick ms, `_snapshot`), oldest first
+        self._overdue: List[Command] = []    # older than the history, for the next tick
+        self._input_log: List[Tuple[int, Command]] = []   # (tick, input) since the oldest snapshot
+        self._replay: List[Tuple[int, Command]] = []      # the same, being re-run after a rollback
+        self._material_snap = None
+        self.rollback_stats = {"rollbacks": 0, "resimulated_ticks": 0, "too_late": 0}
+        self._stepped_ms = 0 if tick_ms else None   # end of the last `step`
+        self.captures: List[Tuple[int, str, str]] = []   # (time, by, captured)
+        self.rules = rules or EndRules()
+        self.result: Optional[Tuple[Optional[str], str]] = None  # (winner or None, reason)
+        self._start_ms: Optional[int] = 0 if tick_ms else None
+        self.frame: Optional[Board] = None
+        self._redraw_at = 0         # game time when the frame next changes
+        self._record_at: Optional[float] = None   # game time of the next video frame
+        self.user_input_queue = CommandRing()
+        self.input_stats = {"accepted": 0, "rejected": 0, "coalesced": 0}
+        self.input_latency = deque(maxlen=1024)   # ms from input to applied
+        self._selected: Optional[str] = None      # piece picked by the last click
         self.pieces = { p.piece_id : p for p in pieces}
+        self.attack_map = AttackMap((board.H_cells, board.W_cells), self.pieces)
+        self.material = Material(self.pieces)
         pass
 
     # ─── helpers ─────────────────────────────────────────────────────────────
     def game_time_ms(self) -> int:
         """Return the current game time in milliseconds."""
+        if self.tick_ms:
+            return self.sim_ms
+        return self._wall_ms()
+
+    @staticmethod
+    def _wall_ms() -> int:
         return int(round(time.monotonic() * 1000))
 
     def clone_board(self) -> Board:
@@ -28,77 +99,493 @@ class Game:
         Return a **brand-new** Board wrapping a copy of the background pixels
         so we can paint sprites without touching the pristine board.
         """
-        new_board = Board(
-            cell_H_pix=self.board.cell_H_pix,
-            cell_W_pix=self.board.cell_W_pix,
-            W_cells=self.board.W_cells,
-            H_cells=self.board.H_cells,
-            img=Img().read(self.board.img.img)  # Clone the image
-        )   
+        new_board = self.board.clone()
         if new_board.img is None:
             raise InvalidBoard("Failed to clone board image.")
         return new_board
 
     def start_user_input_thread(self):
-        """Start the user input thread for mouse handling."""
-        
-        pass
+        """
+        Route window clicks and keys to `user_input_queue`.
+
+        No thread is needed: the window's callbacks run on the game-loop
+        thread while `_show` pumps its events.
+        """
+        if isinstance(self.sink, WindowSink):
+            self.sink.on_click = self._on_click
+            self.sink.on_key = self._on_key
+
+    def _on_click(self, x: int, y: int):
+        """First click picks a piece; the next one moves it there (or jumps, on itself)."""
+        cell = (y // self.board.cell_H_pix, x // self.board.cell_W_pix)
+        picked = self.pieces.get(self._selected)
+        if picked is None:
+            self._selected = self.attack_map.occupant(cell)
+            return
+        src = picked.cell
+        if cell == src:
+            self._queue_input(picked.piece_id, "Jump", [self.board.to_square(src)])
+        else:
+            self._queue_input(picked.piece_id, "Move",
+                              [self.board.to_square(src), self.board.to_square(cell)])
+        self._selected = None
+
+    def _on_key(self, key: int):
+        """"j" makes the picked piece jump."""
+        picked = self.pieces.get(self._selected)
+        if picked is not None and chr(key) == "j":
+            self._queue_input(picked.piece_id, "Jump", [self.board.to_square(picked.cell)])
+            self._selected = None
+
+    def _queue_input(self, piece_id: str, kind: str, params: list):
+        # with fixed ticks `game_time_ms` has already been simulated: stamp
+        # the input just after it rather than roll back for it
+        now = self.game_time_ms() + (1 if self.tick_ms else 0)
+        self.user_input_queue.put(Command(now, piece_id, kind, params))
+
+    def input_latency_ms(self) -> Dict[str, float]:
+        """Median and worst input-to-applied latency over the recent inputs."""
+        if not self.input_latency:
+            return {"median": 0.0, "worst": 0.0}
+        return {"median": statistics.median(self.input_latency),
+                "worst": max(self.input_latency)}
+
+    # ─── memory ─────────────────────────────────────────────────────────────
+    def memory_usage(self, graphics_factory=None) -> Dict[str, int]:
+        """Bytes held per subsystem; see `Memory.usage`."""
+        from Memory import usage
+        return usage(self, graphics_factory)
+
+    def trim_logs(self):
+        """
+        Free log memory: drop the latency samples.  The rollback window is
+        left alone, since shortening it changes which tick late commands
+        land on (and so the result, and lockstep with peers).
+        """
+        self.input_latency.clear()
 
     # ─── main public entrypoint ──────────────────────────────────────────────
     def run(self):
         """Main game loop."""
         self.start_user_input_thread() # QWe2e5
+        if self.assets is not None:
+            self.assets.start()
 
         start_ms = self.game_time_ms()
-        for p in self.pieces:
+        wall_start = self._wall_ms()
+        for p in self.pieces.values():
             p.reset(start_ms)
+        self._stepped_ms = self._start_ms = start_ms
 
         # ─────── main loop ──────────────────────────────────────────────────
         while not self._is_win():
-            now = self.game_time_ms() # monotonic time ! not computer time.
+            if self.tick_ms:
+                # whole ticks only; the remainder waits for the next frame
+                self.advance(start_ms + self._wall_ms() - wall_start)
+                now = self.sim_ms
+            else:
+                now = self.game_time_ms() # monotonic time ! not computer time.
 
-            # (1) update physics & animations
-            for p in self.pieces:
-                p.update(now)
+            if self.assets is not None and self.assets.apply():
+                self._redraw_at = now
 
-            # (2) handle queued Commands from mouse thread
-            while not self.user_input_queue.empty(): # QWe2e5
-                cmd: Command = self.user_input_queue.get()
-                self._process_input(cmd)
+            # (1) update physics & animations, handle queued Commands from
+            #     mouse thread, detect captures
+            if not self.tick_ms:
+                self.step(now) # QWe2e5
 
-            # (3) draw current position
-            self._draw()
-            if not self._show():           # returns False if user closed window
-                break
+            if self.spectators is not None:
+                self.spectators.tick(self.pieces, now)
+            if self.budget is not None:
+                self.budget.enforce(self, now)
 
-            # (4) detect captures
-            self._resolve_collisions()
+            # (2) draw current position (skipped while no sprite changes)
+            if self.frame is None or now >= self._redraw_at:
+                self._draw(now)
+            if self.recorder is not None:
+                self._record(now)
+            if not self._show(self._wait_ms(now)):   # False if user closed window
+                break
 
         self._announce_win()
-        cv2.destroyAllWindows()
+        if self.assets is not None:
+            self.assets.stop()
+        if self.recorder is not None:
+            stats = self.recorder.close()
+            print(f"Recorded {stats['written']} frames, {stats['dropped']} dropped.")
+        self.sink.close()
+        if self.input_latency:
+            lat = self.input_latency_ms()
+            print(f"Input latency: median {lat['median']:.0f} ms, worst {lat['worst']:.0f} ms.")
+
+    def _wait_ms(self, now: int) -> int:
+        """
+        How long `_show` may wait for window events: until the next redraw
+        or tick is due, but at most `INPUT_POLL_MS`, since a click is only
+        applied once the wait ends.
+        """
+        deadline = self._redraw_at
+        if self.tick_ms:
+            deadline = min(deadline, self.sim_ms + self.tick_ms)
+        return int(min(max(deadline - now, 1), INPUT_POLL_MS))
+
+    def step(self, now_ms: int):
+        """Advance the simulation to `now_ms` without drawing (also used headless)."""
+        since = now_ms if self._stepped_ms is None else self._stepped_ms
+        if self._start_ms is None:
+            self._start_ms = since
+        for p in self.pieces.values():
+            p.update(now_ms)
+        self._resolve_collisions(since, now_ms)
+        self._stepped_ms = now_ms
+        self.attack_map.sync(self.pieces)      # moves are validated against it
+
+        for cmd in self._drain_input(now_ms):
+            self._process_input(cmd, now_ms)
+            self._redraw_at = now_ms
+        self.attack_map.sync(self.pieces)
+
+    # ─── fixed timestep / lockstep ──────────────────────────────────────────
+    def advance(self, until_ms: int) -> int:
+        """
+        Run every whole tick up to game time `until_ms`; return ticks run.
+
+        The gap between `sim_ms` and `until_ms` is the accumulator: it is
+        only consumed in `tick_ms` slices, so physics, animations and rest
+        timers see the same integer timestamps however the frames fall.
+        Lockstep peers call this with the agreed tick time instead of a clock.
+        """
+        if self._history is not None and not self._history:
+            self._history.append((self.sim_ms, self._snapshot()))
+        self._roll_back_for_late_input()
+        n = 0
+        while self.sim_ms + self.tick_ms <= until_ms:
+            self._tick()
+            n += 1
+        return n
+
+    def _tick(self):
+        self.sim_ms += self.tick_ms
+        self.step(self.sim_ms)
+        if self._history is not None:
+            self._history.append((self.sim_ms, self._snapshot()))
+            oldest = self._history[0][0]
+            if self._input_log and self._input_log[0][0] <= oldest:
+                self._input_log = [(t, c) for t, c in self._input_log if t > oldest]
+
+    def _roll_back_for_late_input(self):
+        """
+        Apply commands stamped for a tick that already ran: go back to the
+        last snapshot before the earliest of them, put every input applied
+        since then back in line with the late ones, and re-run the ticks
+        up to where the game was.  Commands older than the history are
+        applied at the next tick instead (and counted once as too late).
+        """
+        if not self._history:
+            return
+        self._held += self.user_input_queue.drain()
+        oldest = self._history[0][0]
+        overdue = [c for c in self._held if c.timestamp <= oldest]
+        if overdue or self._overdue:
+            self.rollback_stats["too_late"] += len(overdue)
+            self._overdue += overdue
+            self._held = [c for c in self._held if c.timestamp > oldest]
+            return
+        late = [c.timestamp for c in self._held if c.timestamp <= self.sim_ms]
+        if not late:
+            return
+        ts = min(late)
+
+        target = self.sim_ms
+        while self._history[-1][0] >= ts:
+            self._history.pop()
+        snap_ms, snap = self._history[-1]
+        self._restore(snap)
+        self._replay = [(t, c) for t, c in self._input_log if t > snap_ms]
+        self._input_log = [(t, c) for t, c in self._input_log if t <= snap_ms]
+        self.rollback_stats["rollbacks"] += 1
+        while self.sim_ms < target:
+            self._tick()
+            self.rollback_stats["resimulated_ticks"] += 1
+        self._redraw_at = self.sim_ms
+
+    def _snapshot(self) -> tuple:
+        if self._material_snap is None:         # material only changes on captures
+            self._material_snap = self.material.snapshot()
+        return (self.sim_ms, self._stepped_ms, self._start_ms,
+                tuple((p, p.snapshot()) for p in self.pieces.values()),
+                len(self.captures), self._material_snap, self.result)
+
+    def _restore(self, snap: tuple):
+        (self.sim_ms, self._stepped_ms, self._start_ms, pieces,
+         n_captures, self._material_snap, self.result) = snap
+        self.pieces = {p.piece_id: p for p, _ in pieces}
+        for p, piece_snap in pieces:
+            p.restore(piece_snap)
+        del self.captures[n_captures:]
+        self.material.restore(self._material_snap)
+        self.attack_map.sync(self.pieces)
+
+    def state_hash(self) -> str:
+        """
+        Digest of the simulation state, comparable across processes.
+
+        Covers every piece's state, cell and timers; uses no `hash()` so
+        string hash randomisation cannot leak in.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(self.sim_ms if self.tick_ms else 0).encode())
+        for pid in sorted(self.pieces):
+            p = self.pieces[pid]
+            ph = p._state._physics
+            h.update(f"|{pid}:{p.state_name}:{p.cell}:{ph.start_ms}:"
+                     f"{ph.duration_ms}:{getattr(ph, 'target', p.cell)}".encode())
+        return h.hexdigest()
+
+    # ─── input validation ───────────────────────────────────────────────────
+    def _drain_input(self, now_ms: Optional[int] = None) -> List[Command]:
+        """
+        Take everything queued so far, in timestamp order.
+
+        Commands stamped after `now_ms` are held back until the tick that
+        reaches them; ties are broken by piece id, type and params so every
+        peer applies a given batch in the same order.
+
+        Exact repeats (same piece, type and params) are coalesced, and only
+        the first command that passes `_validate` is kept per piece: once
+        it is applied the piece is busy, so the rest would be refused by
+        its state machine anyway.
+
+        After a rollback, logged inputs come back at the tick that first
+        took them; `input_stats` and `input_latency` count each command
+        the first time only.
+        """
+        batch = self._held + self.user_input_queue.drain()
+        replayed = []
+        if now_ms is not None:
+            self._held = [c for c in batch if c.timestamp > now_ms]
+            batch = self._overdue + [c for c in batch if c.timestamp <= now_ms]
+            self._overdue = []
+            replayed = [c for t, c in self._replay if t <= now_ms]
+            self._replay = [(t, c) for t, c in self._replay if t > now_ms]
+            if self._history is not None:
+                self._input_log += [(now_ms, c) for c in batch + replayed]
+        fresh = {id(c) for c in batch}
+        batch += replayed
+        batch.sort(key=lambda c: (c.timestamp, c.piece_id, c.type, str(c.params)))
+
+        seen, busy, out = set(), set(), []
+        claimed = self._claimed_targets() if batch else set()
+        for cmd in batch:
+            counts = id(cmd) in fresh
+            key = (cmd.piece_id, cmd.type, tuple(cmd.params))
+            if key in seen or cmd.piece_id in busy:
+                self.input_stats["coalesced"] += counts
+                continue
+            seen.add(key)
+            if not self._validate(cmd, claimed):
+                self.input_stats["rejected"] += counts
+                continue
+            busy.add(cmd.piece_id)
+            if cmd.type == "Move":
+                claimed.add((AttackMap.color_of(cmd.piece_id), self.board.to_cell(cmd.params[-1])))
+            if counts:
+                self.input_stats["accepted"] += 1
+                self.input_latency.append(
+                    (now_ms if now_ms is not None else self.game_time_ms()) - cmd.timestamp)
+            out.append(cmd)
+        return out
+
+    def _validate(self, cmd: Command, claimed=frozenset()) -> bool:
+        """
+        Reject unknown pieces, commands the piece's state refuses, and
+        moves that are not legal on the board as it stands (see
+        `AttackMap.legal_moves`: move-table tags, blocked rays, own
+        pieces) or that end where a piece of the same colour is already
+        heading (`claimed`, (colour, cell) pairs).
+        """
+        piece = self.pieces.get(cmd.piece_id)
+        if piece is None or not piece.is_command_possible(cmd):
+            return False
+        if cmd.type != "Move":
+            return True
+        target = self.board.to_cell(cmd.params[-1])
+        return target in self.attack_map.legal_moves(cmd.piece_id) \
+            and (AttackMap.color_of(cmd.piece_id), target) not in claimed
+
+    def _claimed_targets(self) -> set:
+        """(colour, cell) of every travelling piece's destination."""
+        return {(AttackMap.color_of(pid), path[3])
+                for pid, p in self.pieces.items() if (path := p.path()) is not None}
 
     # ─── drawing helpers ────────────────────────────────────────────────────
-    def _process_input(self, cmd : Command):
-        self.pieces[cmd.piece_id].on_command(cmd)
+    def _process_input(self, cmd : Command, now_ms: Optional[int] = None):
+        if now_ms is None:
+            now_ms = self.game_time_ms()
+        self.pieces[cmd.piece_id].on_command(cmd, now_ms)
 
-    def _draw(self):
+    def _draw(self, now: Optional[int] = None):
         """Draw the current game state."""
-        pass
+        if now is None:
+            now = self.game_time_ms()
+        self.frame = self.clone_board()
+        sprites, placements = {}, []
+        for i, p in enumerate(self.pieces.values()):
+            sprites[i], x, y = p.sprite_at(now)
+            placements.append((i, x, y))
+        self.frame.img.draw_batch(placements, sprites)
 
-    def _show(self) -> bool:
-        """Show the current frame and handle window events."""
-        pass
+        times = [t for t in (p.next_frame_ms(now) for p in self.pieces.values())
+                 if t is not None]
+        self._redraw_at = min(times) if times else float("inf")
+
+    def _record(self, now: int):
+        """
+        Push one video frame per 1000/fps ms of game time up to `now`, so
+        the video plays at game speed whatever the loop rate; while the
+        frame is not redrawn the same picture is pushed again.
+        """
+        if self._record_at is None:
+            self._record_at = now
+        while self._record_at <= now:
+            self.recorder.push(self.frame.img)
+            self._record_at += 1000 / self.recorder.fps
+
+    def _show(self, wait_ms: int = 1) -> bool:
+        """Show the current frame and handle window events for up to `wait_ms`."""
+        return self.sink.show(self.frame.img, wait_ms)
 
     # ─── capture resolution ────────────────────────────────────────────────
-    def _resolve_collisions(self):
-        """Resolve piece collisions and captures."""
-        pass
+    def _resolve_collisions(self, since_ms: int, now_ms: int):
+        """
+        Resolve every capture that happened during (since_ms, now_ms].
+
+        Each piece's trail (every travel segment it was on during the
+        step) gives its whole path, so the sweep finds pieces that met
+        between two steps however far apart they are.  Contacts are
+        resolved in time order and a captured piece takes no part in
+        later ones.
+        """
+        paths, statuses = {}, {}
+        for pid, p in self.pieces.items():
+            paths[pid] = Path(p.cell, p.take_trail())
+            statuses[pid] = p.take_status()
+
+        for t, a, b in sweep(paths, since_ms, now_ms):
+            if a not in self.pieces or b not in self.pieces:
+                continue
+            if AttackMap.color_of(a) == AttackMap.color_of(b):
+                continue
+            outcome = self._contact_outcome(a, b, t, paths, statuses)
+            if outcome is not None:
+                self._capture(*outcome, int(t))
+
+    def _contact_outcome(self, a: str, b: str, t: float, paths: Dict[str, Path],
+                         statuses: Dict[str, list]) -> Optional[Tuple[str, str]]:
+        """
+        (winner, captured) for enemies `a` and `b` touching at `t`.
+
+        The travelling piece attacks the standing one; of two travelling
+        pieces the one that set off first attacks.  The defender is
+        captured unless it can't be (jumping), in which case it captures
+        the attacker if it is able to.  The defender is judged by the
+        state it was in at `t`, from its status log for the step.
+        """
+        starts = {pid: paths[pid].moving_since(t) for pid in (a, b)}
+        movers = sorted((s, pid) for pid, s in starts.items() if s is not None)
+        if not movers:
+            return None
+        attacker = movers[0][1]
+        defender = b if attacker == a else a
+        status = statuses[defender]
+        i = bisect_right(status, t, key=lambda s: s[0])
+        _, can_be_captured, can_capture = status[max(i - 1, 0)]
+        if can_be_captured:
+            return attacker, defender
+        if can_capture:
+            return defender, attacker
+        return None
+
+    def _capture(self, by: str, captured: str, t_ms: int):
+        del self.pieces[captured]
+        self.captures.append((t_ms, by, captured))
+        self._redraw_at = t_ms
+        self.material.remove(captured)
+        self._material_snap = None
+        self._check_end()
+
+    def _check_end(self):
+        """Settle `result` from the material counters (after a capture)."""
+        if self.result is not None:
+            return
+        losers = {c: why for c in self.material.colors
+                  if (why := self.material.lost(c, self.rules)) is not None}
+        if losers:
+            others = [c for c in self.material.colors if c not in losers]
+            winner = others[0] if len(others) == 1 else None
+            self.result = (winner, next(iter(losers.values())))
 
     # ─── board validation & win detection ───────────────────────────────────
     def _is_win(self) -> bool:
-        """Check if the game has ended."""
-        pass
+        """
+        Check if the game has ended.
+
+        O(1): captures settle `result` as they happen (see `_check_end`);
+        only the time limit is compared here.
+        """
+        limit = self.rules.time_limit_ms
+        if self.result is None and limit is not None and self._start_ms is not None \
+                and self._stepped_ms - self._start_ms >= limit:
+            self.result = (self.material.leader(), "time limit")
+        return self.result is not None
 
     def _announce_win(self):
         """Announce the winner."""
-        pass
+        if self.result is None:
+            return
+        winner, reason = self.result
+        print(f"{'Draw' if winner is None else winner + ' wins'} ({reason}).")
+
+
+def _bench_input(n: int = 200_000, burst: int = 1000, pieces: int = 16):
+    """
+    Queue `n` random commands for the first `pieces` pieces in bursts of
+    `burst`, draining and validating after each burst (nothing is applied,
+    so the board stays put and every burst sees the same position).
+    """
+    import pathlib
+    import random
+
+    from FrameSink import NullSink
+    from PieceFactory import PieceFactory
+
+    root = pathlib.Path(__file__).resolve().parent.parent
+    board = Board(cell_H_pix=64, cell_W_pix=64, cell_H_m=1, cell_W_m=1,
+                  W_cells=8, H_cells=8, img=Img())
+    factory = PieceFactory(board, root / "pieces")
+    game = Game(factory.create_board_pieces(root / "pieces" / "board.csv"), board,
+                sink=NullSink())
+    rng = random.Random(0)
+    ids = list(game.pieces)[:pieces]
+    squares = [board.to_square((r, c)) for r in range(8) for c in range(8)]
+    cmds = []
+    for i in range(n):
+        pid = rng.choice(ids)
+        cmds.append(Command(i, pid, "Move", [board.to_square(game.pieces[pid].cell),
+                                             rng.choice(squares)]))
+
+    valid = 0
+    t = time.perf_counter()
+    for i in range(0, n, burst):
+        for cmd in cmds[i:i + burst]:
+            game.user_input_queue.put(cmd)
+        valid += len(game._drain_input())
+    elapsed = time.perf_counter() - t
+    print(f"put + drain + validate : {n / elapsed:>12,.0f} commands/s "
+          f"({burst}-command bursts over {pieces} pieces)")
+    print(f"valid {valid}, rejected {game.input_stats['rejected']}, "
+          f"coalesced {game.input_stats['coalesced']}")
+
+
+if __name__ == "__main__":
+    _bench_input()
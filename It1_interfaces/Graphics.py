@@ -1,4 +1,5 @@
 import pathlib
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 import copy
@@ -7,27 +8,112 @@ from Command import Command
 from Board import Board
 
 
+def sprite_paths(sprites_folder: pathlib.Path) -> List[pathlib.Path]:
+    """Frame files of a sprites folder in animation order (1.png, 2.png, …)."""
+    return sorted(pathlib.Path(sprites_folder).glob("*.png"),
+                  key=lambda p: int(p.stem) if p.stem.isdigit() else p.stem)
+
+
+class Timeline:
+    """
+    An animation compiled to the start time (ms) of every frame.
+
+    Which frame shows, and when it next changes, are pure functions of the
+    ms elapsed since the animation started.
+    """
+
+    def __init__(self, n_frames: int, fps: float, loop: bool):
+        self.n_frames = n_frames if fps > 0 else min(n_frames, 1)
+        self.loop = loop
+        self.starts = [round(i * 1000 / fps) if fps > 0 else 0 for i in range(self.n_frames)]
+        self.cycle_ms = round(self.n_frames * 1000 / fps) if fps > 0 else 0
+
+    def frame_at(self, elapsed_ms: int) -> int:
+        if self.n_frames <= 1 or elapsed_ms <= 0:
+            return 0
+        if self.loop:
+            elapsed_ms %= self.cycle_ms
+        return bisect_right(self.starts, elapsed_ms) - 1
+
+    def next_change(self, elapsed_ms: int) -> Optional[int]:
+        """Elapsed ms of the next frame switch; None if there is none."""
+        if self.n_frames <= 1:
+            return None
+        if elapsed_ms < 0:
+            return 0
+        base = 0
+        if self.loop:
+            base = elapsed_ms - elapsed_ms % self.cycle_ms
+        i = bisect_right(self.starts, elapsed_ms - base)
+        if i < self.n_frames:
+            return base + self.starts[i]
+        return base + self.cycle_ms if self.loop else None
+
+
 class Graphics:
     def __init__(self,
                  sprites_folder: pathlib.Path,
                  board: Board,
                  loop: bool = True,
-                 fps: float = 6.0):
-        """Initialize graphics with sprites folder, cell size, loop setting, and FPS."""
-        pass
+                 fps: float = 6.0,
+                 frames: Optional[List[Img]] = None):
+        """Initialize graphics with sprites folder, cell size, loop setting, and FPS.
+
+        `frames` lets a factory hand over already-scaled sprites; when it is
+        omitted the frames are read from disk at the board's cell size.
+        """
+        self.sprites_folder = pathlib.Path(sprites_folder)
+        self.board = board
+        self.loop = loop
+        self.fps = fps
+        self.frame_paths = sprite_paths(self.sprites_folder)
+        if frames is None:
+            size = (board.cell_W_pix, board.cell_H_pix)
+            frames = [Img().read(p, size) for p in self.frame_paths]
+        self.frames: List[Img] = frames
+        self.timeline = Timeline(len(frames), fps, loop)
+        self.start_ms = 0
 
     def copy(self):
         """Create a shallow copy of the graphics object."""
-        pass
+        return copy.copy(self)   # frames are shared, never mutated
 
     def reset(self, cmd: Command):
         """Reset the animation with a new command."""
-        pass
+        self.start_ms = cmd.timestamp
 
     def update(self, now_ms: int):
-        """Advance animation frame based on game-loop time, not wall time."""
-        pass
+        """Advance animation frame based on game-loop time, not wall time.
 
-    def get_img(self) -> Img:
-        """Get the current frame image."""
+        Nothing to do: the frame is looked up from `timeline` in `get_img`.
+        """
         pass
+
+    def next_change_ms(self, now_ms: int) -> Optional[int]:
+        """Game time at which the shown frame changes next (None = never)."""
+        nxt = self.timeline.next_change(now_ms - self.start_ms)
+        return None if nxt is None else self.start_ms + nxt
+
+    def set_frames(self, frames: List[Img],
+                   frame_paths: Optional[List[pathlib.Path]] = None):
+        """Swap in frames of another size, or a reloaded set of `frame_paths`."""
+        if frame_paths is not None:
+            self.frame_paths = frame_paths
+        if len(frames) != len(self.frames):
+            self.timeline = Timeline(len(frames), self.fps, self.loop)
+        self.frames = frames
+
+    def set_timing(self, fps: float, loop: bool):
+        """Change frames_per_sec / is_loop of a running animation."""
+        self.fps, self.loop = fps, loop
+        self.timeline = Timeline(len(self.frames), fps, loop)
+
+    def frame_index(self, now_ms: int) -> int:
+        """Index into `frames` of the frame shown at `now_ms`."""
+        return self.timeline.frame_at(now_ms - self.start_ms)
+
+    def get_img(self, now_ms: Optional[int] = None) -> Img:
+        """Get the frame shown at `now_ms` (the first one if omitted)."""
+        if now_ms is None:
+            return self.frames[0]
+        return self.frames[self.frame_index(now_ms)]
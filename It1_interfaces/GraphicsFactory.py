@@ -1,13 +1,181 @@
 import pathlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from Graphics import Graphics
+from Board import Board
+from Graphics import Graphics, sprite_paths
+from img import Img, cv2
 
 
 class GraphicsFactory:
+    """
+    Builds `Graphics` objects and owns the sprite cache.
+
+    Every frame is decoded from disk once and kept as a mip chain
+    (full size, ½, ¼, …, built lazily).  A request for a given cell size
+    is served from the smallest mip level that is still at least that
+    big, and the scaled result is kept in an LRU cache.  Levels bigger
+    than needed for the largest size asked for so far are dropped, so
+    the full-size decode is not kept; switching to a smaller resolution
+    never touches the disk again, a larger one decodes the file anew.
+
+    The caches are shared with `AssetWatcher`'s thread, which reloads
+    sprite folders while the game reads frames, so every access to them
+    holds `_lock`.
+    """
+
+    def __init__(self, board: Optional[Board] = None, max_cached: int = 1024):
+        self.board = board
+        self.max_cached = max_cached
+        self._mips: Dict[pathlib.Path, List[Img]] = {}   # largest level kept first
+        self._need: Dict[pathlib.Path, Tuple[int, int]] = {}  # largest size asked for
+        self._scaled: "OrderedDict[Tuple[pathlib.Path, Tuple[int, int]], Img]" = OrderedDict()
+        self._shared: Dict[Tuple[pathlib.Path, Tuple[int, int]], Img] = {}
+        self._lock = threading.RLock()
+
     def load(self,
              sprites_dir: pathlib.Path,
              cfg: dict,
              cell_size: tuple[int, int]) -> Graphics:
         """Load graphics from sprites directory with configuration."""
-        pass
-    
\ No newline at end of file
+        frames = [self.get_frame(p, cell_size) for p in sprite_paths(sprites_dir)]
+        return Graphics(sprites_dir, self.board,
+                        loop=cfg.get("is_loop", True),
+                        fps=cfg.get("frames_per_sec", 6.0),
+                        frames=frames)
+
+    def rescale(self, graphics: Graphics, cell_size: tuple[int, int]):
+        """Switch an existing `Graphics` to another cell size in place."""
+        graphics.set_frames([self.get_frame(p, cell_size) for p in graphics.frame_paths])
+
+    def prewarm(self, sprites_dir: pathlib.Path, sizes: List[tuple[int, int]]):
+        """Scale every frame of `sprites_dir` to each of `sizes` ahead of time."""
+        for p in sprite_paths(sprites_dir):
+            for size in sizes:
+                self.get_frame(p, size)
+
+    def reload(self, sprites_dir: pathlib.Path,
+               cell_size: tuple[int, int]) -> Tuple[List[pathlib.Path], List[Img]]:
+        """
+        Re-read one sprites folder from disk, leaving every other cached
+        sprite alone.  Returns the folder's frame paths and their frames.
+        """
+        sprites_dir = pathlib.Path(sprites_dir)
+        with self._lock:
+            for path in {p for p in self._mips if p.parent == sprites_dir} | \
+                        {k[0] for k in self.cached_frames() if k[0].parent == sprites_dir}:
+                self.evict(path)
+        paths = sprite_paths(sprites_dir)
+        return paths, [self.get_frame(p, cell_size) for p in paths]
+
+    def adopt(self, frames: Dict[Tuple[pathlib.Path, Tuple[int, int]], Img]):
+        """
+        Serve these (path, cell size) frames as they are, e.g. read-only
+        views of a `SharedAssets` atlas.  They are never evicted by the LRU.
+        """
+        with self._lock:
+            self._shared.update({(pathlib.Path(p), tuple(size)): img
+                                 for (p, size), img in frames.items()})
+
+    def cached_frames(self) -> Dict[Tuple[pathlib.Path, Tuple[int, int]], Img]:
+        """Every scaled frame currently cached, keyed by (path, cell size)."""
+        with self._lock:
+            return {**self._scaled, **self._shared}
+
+    def cached_images(self) -> List[Img]:
+        """Every image the cache holds: scaled frames and mip levels."""
+        with self._lock:
+            return [*self.cached_frames().values(),
+                    *(level for chain in self._mips.values() for level in chain)]
+
+    def trim(self, keep: Iterable[Img] = ()) -> int:
+        """
+        Free memory: drop every mip level and every scaled frame not in
+        `keep` (frames still on screen).  Returns how many images went;
+        anything dropped is decoded again on its next request.
+        """
+        keep = {id(img) for img in keep}
+        with self._lock:
+            dropped = sum(len(chain) for chain in self._mips.values())
+            self._mips.clear()
+            for key in [k for k, img in self._scaled.items() if id(img) not in keep]:
+                del self._scaled[key]
+                dropped += 1
+        return dropped
+
+    # ─── sprite cache ───────────────────────────────────────────────────────
+    def get_frame(self, path: pathlib.Path, cell_size: tuple[int, int]) -> Img:
+        """Return the frame at `path` scaled to `cell_size` (width, height)."""
+        with self._lock:
+            return self._get_frame((pathlib.Path(path), tuple(cell_size)))
+
+    def _get_frame(self, key: Tuple[pathlib.Path, Tuple[int, int]]) -> Img:
+        frame = self._shared.get(key)
+        if frame is not None:
+            return frame
+        frame = self._scaled.get(key)
+        if frame is not None:
+            self._scaled.move_to_end(key)
+            return frame
+
+        w, h = key[1]
+        src = self._mip_level(key[0], w, h)
+        frame = Img()
+        if src.img.shape[1] == w and src.img.shape[0] == h:
+            frame.img = src.img
+        else:
+            shrink = src.img.shape[1] >= w and src.img.shape[0] >= h
+            frame.img = cv2.resize(src.img, (w, h),
+                                   interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR)
+
+        self._scaled[key] = frame
+        while len(self._scaled) > self.max_cached:
+            self._scaled.popitem(last=False)
+        return frame
+
+    def _mip_level(self, path: pathlib.Path, w: int, h: int) -> Img:
+        """Smallest mip level of `path` that is still at least w×h."""
+        old_w, old_h = self._need.get(path, (0, 0))
+        need_w, need_h = self._need[path] = max(old_w, w), max(old_h, h)
+        chain = self._mips.get(path)
+        if chain is None or ((w > old_w or h > old_h) and
+                             (chain[0].img.shape[1] < w or chain[0].img.shape[0] < h)):
+            chain = self._mips[path] = [Img().read(path)]
+
+        while True:
+            last = chain[-1].img
+            lh, lw = last.shape[:2]
+            if lw // 2 < w or lh // 2 < h:
+                break
+            half = Img()
+            half.img = cv2.resize(last, (lw // 2, lh // 2), interpolation=cv2.INTER_AREA)
+            chain.append(half)
+
+        # levels only a size bigger than any asked for would use
+        while len(chain) > 1 and chain[1].img.shape[1] >= need_w \
+                and chain[1].img.shape[0] >= need_h:
+            del chain[0]
+
+        for level in reversed(chain):
+            lh, lw = level.img.shape[:2]
+            if lw >= w and lh >= h:
+                return level
+        return chain[0]
+
+    def evict(self, path: Optional[pathlib.Path] = None):
+        """Drop cached sprites, either all of them or those of one file."""
+        with self._lock:
+            if path is None:
+                self._mips.clear()
+                self._need.clear()
+                self._scaled.clear()
+                self._shared.clear()
+                return
+            path = pathlib.Path(path)
+            self._mips.pop(path, None)
+            self._need.pop(path, None)
+            for key in [k for k in self._shared if k[0] == path]:
+                del self._shared[key]
+            for key in [k for k in self._scaled if k[0] == path]:
+                del self._scaled[key]
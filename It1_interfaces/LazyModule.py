@@ -0,0 +1,56 @@
+"""
+Deferred imports for headless startup.
+
+`cv2 = LazyModule("cv2")` stands in for the module until an attribute is
+first used, so simulation workers that never decode, scale or show an
+image never import OpenCV.  Run this file for the startup benchmark: it
+times `import SelfPlay` (the headless entry point) in fresh interpreters,
+as it is and with cv2 imported up front, and fails if cv2 came along.
+"""
+import importlib
+import os
+import subprocess
+import sys
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        """Import `name` on first attribute access."""
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+
+_PROBE = ("import sys, time; t = time.perf_counter(); import {modules}; "
+          "print((time.perf_counter() - t) * 1000, 'cv2' in sys.modules)")
+
+
+def startup_ms(module: str = "SelfPlay", runs: int = 5, eager: bool = False):
+    """
+    Best import time of `module` over `runs` fresh interpreters, and
+    whether cv2 came along; `eager` imports cv2 first, as the baseline.
+    """
+    modules = f"cv2, {module}" if eager else module
+    best, with_cv2 = float("inf"), False
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(modules=modules)],
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True).stdout.split()
+        best, with_cv2 = min(best, float(out[0])), out[1] == "True"
+    return best, with_cv2
+
+
+if __name__ == "__main__":
+    ms, with_cv2 = startup_ms()
+    eager_ms, _ = startup_ms(eager=True)
+    print(f"import SelfPlay: {ms:.0f} ms, cv2 {'loaded' if with_cv2 else 'deferred'}; "
+          f"with cv2 eager: {eager_ms:.0f} ms ({eager_ms - ms:+.0f} ms, x{eager_ms / ms:.2f})")
+    sys.exit(1 if with_cv2 else 0)
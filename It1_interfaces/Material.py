@@ -0,0 +1,72 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from AttackMap import AttackMap
+
+
+KING = "K"
+
+
+def kind_of(piece_id: str) -> str:
+    """Piece kind letter(s): "K" for "KW_0"."""
+    return piece_id.split("_")[0][:-1]
+
+
+color_of = AttackMap.color_of
+
+
+@dataclass
+class EndRules:
+    """When a game is over; None / False switches a condition off."""
+    king_capture: bool = True               # losing your last king loses
+    min_pieces: Optional[int] = None        # dropping below this many pieces loses
+    time_limit_ms: Optional[int] = None     # then the side with more pieces wins
+
+
+class Material:
+    """
+    Live per-colour piece counts, changed only on captures, so end
+    conditions are checked without scanning the pieces.
+    """
+
+    def __init__(self, piece_ids: Iterable[str]):
+        self._kinds: Dict[str, Counter] = {}
+        self._total: Counter = Counter()
+        for pid in piece_ids:
+            self._kinds.setdefault(color_of(pid), Counter())[kind_of(pid)] += 1
+            self._total[color_of(pid)] += 1
+        self.colors: Tuple[str, ...] = tuple(sorted(self._kinds))
+        self._had_king = {c: self._kinds[c][KING] > 0 for c in self.colors}
+
+    def remove(self, piece_id: str):
+        """A piece was captured."""
+        color = color_of(piece_id)
+        self._kinds[color][kind_of(piece_id)] -= 1
+        self._total[color] -= 1
+
+    def snapshot(self) -> tuple:
+        return {c: k.copy() for c, k in self._kinds.items()}, self._total.copy()
+
+    def restore(self, snap: tuple):
+        kinds, total = snap
+        self._kinds = {c: k.copy() for c, k in kinds.items()}
+        self._total = total.copy()
+
+    def count(self, color: str, kind: Optional[str] = None) -> int:
+        return self._total[color] if kind is None else self._kinds[color][kind]
+
+    def lost(self, color: str, rules: EndRules) -> Optional[str]:
+        """Reason `color` has lost under `rules`, or None."""
+        if rules.king_capture and self._had_king[color] and not self._kinds[color][KING]:
+            return "king captured"
+        if rules.min_pieces is not None and self._total[color] < rules.min_pieces:
+            return "too few pieces"
+        return None
+
+    def leader(self) -> Optional[str]:
+        """The colour with the most pieces, None on a tie."""
+        ranked = sorted(self.colors, key=lambda c: -self._total[c])
+        if not ranked or (len(ranked) > 1 and self._total[ranked[0]] == self._total[ranked[1]]):
+            return None
+        return ranked[0]
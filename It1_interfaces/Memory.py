@@ -0,0 +1,223 @@
+"""
+Memory accounting and budget enforcement.
+
+`usage(game)` reports the bytes a game holds per subsystem:
+
+    sprite_cache   decoded sprites: every frame the pieces can show, their
+                   cooldown-shaded copies, and (given the GraphicsFactory)
+                   its mip levels and scaled sizes
+    board          the background and the last drawn frame
+    pieces         pieces, their state machines, move tables, attack map
+    commands       the input ring and commands waiting for their tick
+    logs           capture log, latency samples, rollback snapshots
+
+Every object is counted once, in the first subsystem that reaches it, in
+the order above; numpy arrays are counted by the buffer they view, so
+shared sprites and `SharedAssets` views are not counted twice.
+
+`MemoryBudget` checks the total now and then and, over the limit, frees
+what is cheapest to rebuild first: unused sprite sizes and mip levels,
+then shaded copies, then the latency samples.  Rollback snapshots and the
+capture log are never trimmed: they decide where late commands land, so
+trimming them would let a memory limit change the game.  Run this file
+for a report comparing the standard game with a 15x16 board (the most
+ranks `Command`'s one-byte squares can address).
+"""
+import sys
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from GraphicsFactory import GraphicsFactory
+from img import Img
+from Piece import clear_shaded, shaded_sprites
+
+SUBSYSTEMS = ("sprite_cache", "board", "pieces", "commands", "logs")
+
+_CONTAINERS = (tuple, list, set, frozenset, deque)
+
+
+def _buffer_bytes(arr: np.ndarray, seen: Dict[int, object]) -> int:
+    owner = arr
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    if owner.base is not None:              # wraps a bytearray / shared memory
+        owner = owner.base
+    if id(owner) in seen:
+        return 0
+    seen[id(owner)] = owner
+    if isinstance(owner, np.ndarray):
+        return owner.nbytes
+    return memoryview(owner).nbytes
+
+
+def deep_bytes(obj, seen: Dict[int, object]) -> int:
+    """
+    Bytes held by `obj` and the plain data under it (containers, numbers,
+    strings, arrays).  Other objects count as themselves and their
+    attribute dict, without following the attributes.
+
+    `seen` maps id -> object for everything already counted; it keeps the
+    objects alive so a freed temporary's id cannot be mistaken for it.
+    """
+    total, stack = 0, [obj]
+    while stack:
+        o = stack.pop()
+        if o is None or id(o) in seen:
+            continue
+        if isinstance(o, np.ndarray):
+            total += sys.getsizeof(o) if o.base is not None else 0
+            total += _buffer_bytes(o, seen)
+            continue
+        seen[id(o)] = o
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, _CONTAINERS):
+            stack.extend(o)
+        elif isinstance(o, Img):
+            stack.extend((o.img, getattr(o, "_planes", None)))
+        elif hasattr(o, "__dict__") and id(o.__dict__) not in seen:
+            seen[id(o.__dict__)] = o.__dict__
+            total += sys.getsizeof(o.__dict__)
+    return total
+
+
+def _states(piece) -> List:
+    """Every state of `piece`'s state machine."""
+    found, stack = {}, [piece._state]
+    while stack:
+        s = stack.pop()
+        if id(s) not in found:
+            found[id(s)] = s
+            stack.extend(s.transitions.values())
+    return list(found.values())
+
+
+def sprites_in_use(game) -> List[Img]:
+    """Every frame the game's pieces can show."""
+    return [f for p in game.pieces.values() for s in _states(p) for f in s._graphics.frames]
+
+
+def usage(game, graphics_factory: Optional[GraphicsFactory] = None) -> Dict[str, int]:
+    """Bytes held by `game` per subsystem; see the module docstring."""
+    seen: Dict[int, object] = {}
+    out = dict.fromkeys(SUBSYSTEMS, 0)
+
+    cached = graphics_factory.cached_images() if graphics_factory is not None else []
+    out["sprite_cache"] = deep_bytes([sprites_in_use(game), shaded_sprites(), cached], seen)
+
+    out["board"] = deep_bytes([game.board.img, game.frame and game.frame.img], seen)
+
+    for p in game.pieces.values():
+        for s in _states(p):
+            out["pieces"] += deep_bytes([s, s._physics, s._graphics,
+                                         vars(s._physics), s._moves.__dict__], seen)
+        out["pieces"] += deep_bytes(p, seen) + deep_bytes(vars(p), seen)
+    out["pieces"] += deep_bytes([game.attack_map, vars(game.attack_map)], seen)
+
+    ring = game.user_input_queue
+    out["commands"] = deep_bytes([ring, ring._mem, game._held], seen)
+
+    out["logs"] = deep_bytes([game.captures, game.input_latency, game._input_log,
+                              game._history], seen)
+    return out
+
+
+class MemoryBudget:
+    def __init__(self, limit_bytes: int,
+                 graphics_factory: Optional[GraphicsFactory] = None,
+                 check_every_ms: int = 1000):
+        """
+        Keep a game under `limit_bytes` (as counted by `usage`), checking
+        at most once every `check_every_ms` of game time.
+        """
+        self.limit_bytes = limit_bytes
+        self.graphics_factory = graphics_factory
+        self.check_every_ms = check_every_ms
+        self.trims = 0
+        self.last: Optional[Dict[str, int]] = None
+        self._next_check = None
+
+    def enforce(self, game, now_ms: int) -> Optional[Dict[str, int]]:
+        """
+        Check and trim if due; returns the usage after any trimming, or
+        None when the check was not due.
+        """
+        if self._next_check is not None and now_ms < self._next_check:
+            return None
+        self._next_check = now_ms + self.check_every_ms
+        self.last = usage(game, self.graphics_factory)
+        trims = (lambda: self._trim_sprites(game), clear_shaded, game.trim_logs)
+        for trim in trims:
+            if sum(self.last.values()) <= self.limit_bytes:
+                break
+            trim()
+            self.trims += 1
+            self.last = usage(game, self.graphics_factory)
+        return self.last
+
+    def _trim_sprites(self, game):
+        if self.graphics_factory is not None:
+            self.graphics_factory.trim(keep=sprites_in_use(game))
+
+
+# ─── report ───────────────────────────────────────────────────────────────
+def _play(rows: int, cols: int, duration_ms: int = 5000, tick_ms: int = 20):
+    """
+    Random agents playing `duration_ms` on a `rows`x`cols` board: each
+    side's two starting ranks from board.csv, repeated across the width.
+    """
+    import random
+
+    from Board import Board
+    from FrameSink import NullSink
+    from Game import Game
+    from PieceFactory import PieceFactory
+    from SelfPlay import CELL_PIX, ROOT, RandomAgent
+    from SetupLoader import load_board
+
+    board = Board(cell_H_pix=CELL_PIX, cell_W_pix=CELL_PIX, cell_H_m=1, cell_W_m=1,
+                  W_cells=cols, H_cells=rows,
+                  img=Img().read(ROOT / "board.png", (cols * CELL_PIX, rows * CELL_PIX)))
+    factory = PieceFactory(board, ROOT / "pieces")
+    setup = load_board(ROOT / "pieces" / "board.csv", known=factory._moves)
+    pieces = [factory.create_piece(kind, (row if row < 4 else row + rows - 8, col + dc))
+              for dc in range(0, cols, 8)
+              for kind, row, col in setup.placements.tolist()]
+    game = Game(pieces, board, tick_ms=tick_ms, sink=NullSink())
+    for p in game.pieces.values():
+        p.reset(0)
+
+    rng = random.Random(0)
+    agents = [RandomAgent("W", rng), RandomAgent("B", rng)]
+    for now in range(0, duration_ms + 1, tick_ms):
+        for agent in agents:
+            cmd = agent.act(game, now)
+            if cmd is not None:
+                game.user_input_queue.put(cmd)
+        game.advance(now)
+    game._draw(game.sim_ms)
+    return game, factory.graphics_factory
+
+
+def report(budget_fraction: float = 0.75):
+    """Print usage per subsystem for both boards, then enforce a budget on the large one."""
+    games = {"8x8, 32 pieces": _play(8, 8), "15x16, 64 pieces": _play(15, 16)}
+    usages = {name: g.memory_usage(gf) for name, (g, gf) in games.items()}
+
+    game, gf = games["15x16, 64 pieces"]
+    budget = MemoryBudget(int(sum(usages["15x16, 64 pieces"].values()) * budget_fraction), gf)
+    usages["15x16 under budget"] = budget.enforce(game, game.sim_ms)
+
+    print(f"{'KiB':14s}" + "".join(f"{name:>20s}" for name in usages))
+    for key in (*SUBSYSTEMS, "total"):
+        row = [u[key] if key != "total" else sum(u.values()) for u in usages.values()]
+        print(f"{key:14s}" + "".join(f"{v / 1024:20.1f}" for v in row))
+    print(f"budget {budget.limit_bytes / 1024:.0f} KiB: {budget.trims} trim step(s)")
+
+
+if __name__ == "__main__":
+    report()
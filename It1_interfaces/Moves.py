@@ -2,13 +2,33 @@
 import pathlib
 from typing import List, Tuple
 
+from SetupLoader import load_moves
+
 
 class Moves:
 
     def __init__(self, txt_path: pathlib.Path, dims: Tuple[int, int]):
-        """Initialize moves with rules from text file and board dimensions."""
-        pass
+        """Initialize moves with rules from text file and board dimensions.
+
+        Parsing and the per-cell tables come from `SetupLoader.load_moves`,
+        so a file that was already loaded (same content) is not parsed again.
+        """
+        self.dims = dims                              # (rows, cols)
+        compiled = load_moves(txt_path, dims)
+        self.offsets: List[Tuple[int, int]] = [tuple(o) for o in compiled.offsets.tolist()]
+        self.tags: dict[Tuple[int, int], str] = compiled.tags    # e.g. "capture", "1st"
+        self._table = compiled.table                  # every cell's destinations
+        self._legal = compiled.legal
+        self._rays = compiled.rays
 
     def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
         """Get all possible moves from a given position."""
-        pass
+        return list(self._table[r][c])
+
+    def get_rays(self, r: int, c: int) -> Tuple[Tuple[Tuple[Tuple[int, int], str], ...], ...]:
+        """Destinations from (r, c) grouped into rays of ((cell), tag), nearest first."""
+        return self._rays[r][c]
+
+    def is_legal(self, r: int, c: int, target: Tuple[int, int]) -> bool:
+        """O(1) check that `target` is reachable from (r, c)."""
+        return tuple(target) in self._legal[r][c]
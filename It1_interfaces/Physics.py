@@ -1,40 +1,145 @@
+import math
 from typing import Tuple, Optional
 from Command import Command
 from Board import Board
 
 
 class Physics:
+    _SNAPSHOT = ("cell", "cmd", "start_ms", "duration_ms")   # what a rollback restores
 
     def __init__(self, start_cell: Tuple[int, int],
-                 board: Board, speed_m_s: float = 1.0):
-        """Initialize physics with starting cell, board, and speed."""
-        pass
+                 board: Board, speed_m_s: float = 1.0,
+                 next_state: str = "idle",
+                 duration_ms: Optional[int] = None):
+        """Initialize physics with starting cell, board, and speed.
+
+        `next_state` is the event reported by `update` once the state is
+        over, `duration_ms` how long that takes (None = never ends).
+        """
+        self.board = board
+        self.speed = speed_m_s
+        self.next_state = next_state
+        self.duration_ms = duration_ms
+        self.cell: Tuple[int, int] = tuple(start_cell)
+        self.cmd: Optional[Command] = None
+        self.start_ms = 0
 
     def reset(self, cmd: Command):
-        """Reset physics state with a new command."""
-        pass
+        """Reset physics state with a new command.
+
+        `cmd.params[0]`, when present, is the cell the piece starts from.
+        """
+        self.cmd = cmd
+        self.start_ms = cmd.timestamp
+        if cmd.params:
+            self.cell = self.board.to_cell(cmd.params[0])
 
     def update(self, now_ms: int) -> Command:
-        """Update physics state based on current time."""
-        pass
+        """Update physics state based on current time.
+
+        The event is stamped with the time the state actually ended, not
+        `now_ms`, so what follows starts at the same instant however
+        coarse the steps are.
+        """
+        if self.duration_ms is None or now_ms - self.start_ms < self.duration_ms:
+            return None
+        piece_id = self.cmd.piece_id if self.cmd is not None else ""
+        return Command(self.start_ms + self.duration_ms, piece_id, self.next_state, [self.cell])
+
+    def snapshot(self) -> tuple:
+        """The fields `update` and `reset` change, for `restore`."""
+        return tuple(getattr(self, f) for f in self._SNAPSHOT)
+
+    def restore(self, snap: tuple):
+        for f, v in zip(self._SNAPSHOT, snap):
+            setattr(self, f, v)
 
     def can_be_captured(self) -> bool:
         """Check if this piece can be captured."""
-        pass
+        return True
 
     def can_capture(self) -> bool:
         """Check if this piece can capture other pieces."""
-        pass
+        return True
+
+    def is_moving(self) -> bool:
+        """Whether `get_pos` changes over time."""
+        return False
+
+    def path(self) -> Optional[Tuple[int, Tuple[int, int], int, Tuple[int, int]]]:
+        """(start ms, start cell, end ms, end cell) of the travel, None when standing."""
+        return None
+
+    def cooldown(self, now_ms: int) -> float:
+        """Fraction (0..1) of a rest period still left; 0 when not resting."""
+        return 0.0
 
     def get_pos(self) -> Tuple[int, int]:
         """
         Current pixel-space upper-left corner of the sprite in world coordinates (in meters).
         """
-        pass
+        r, c = self.cell
+        return c * self.board.cell_W_pix, r * self.board.cell_H_pix
 
 class IdlePhysics(Physics):
     ...
 
 class MovePhysics(Physics):
-    ...
+    _SNAPSHOT = Physics._SNAPSHOT + ("start_cell", "target", "_now_ms")
+
+    def reset(self, cmd: Command):
+        """Start travelling from `params[0]` to `params[-1]`."""
+        super().reset(cmd)
+        self.start_cell = self.cell
+        self.target = self.board.to_cell(cmd.params[-1]) if cmd.params else self.cell
+        dr = (self.target[0] - self.start_cell[0]) * self.board.cell_H_m
+        dc = (self.target[1] - self.start_cell[1]) * self.board.cell_W_m
+        # sqrt is correctly rounded on every platform; hypot is up to libm
+        self.duration_ms = int(math.sqrt(dr * dr + dc * dc) * 1000 / self.speed) if self.speed else 0
+        self._now_ms = self.start_ms
+
+    def update(self, now_ms: int) -> Command:
+        self._now_ms = now_ms
+        done = super().update(now_ms)
+        if done is not None:
+            self.cell = self.target
+            done.params = [self.cell]
+        return done
+
+    def is_moving(self) -> bool:
+        return bool(self.duration_ms) and self.target != self.start_cell \
+            and self._now_ms - self.start_ms < self.duration_ms
+
+    def path(self):
+        if not self.duration_ms or self.target == self.start_cell:
+            return None
+        return self.start_ms, self.start_cell, self.start_ms + self.duration_ms, self.target
+
+    def get_pos(self) -> Tuple[int, int]:
+        if not self.duration_ms:
+            return super().get_pos()
+        t = min(max((self._now_ms - self.start_ms) / self.duration_ms, 0.0), 1.0)
+        r = self.start_cell[0] + (self.target[0] - self.start_cell[0]) * t
+        c = self.start_cell[1] + (self.target[1] - self.start_cell[1]) * t
+        return int(round(c * self.board.cell_W_pix)), int(round(r * self.board.cell_H_pix))
+
+class JumpPhysics(Physics):
+    """Airborne in place for one cell's worth of travel time."""
+
+    def reset(self, cmd: Command):
+        super().reset(cmd)
+        self.duration_ms = int(self.board.cell_H_m / self.speed * 1000) if self.speed else 0
+
+    def can_be_captured(self) -> bool:
+        return False
+
+class RestPhysics(Physics):
+    """Cooldown after a move or jump: the piece can't act until it ends."""
+
+    def can_capture(self) -> bool:
+        return False
 
+    def cooldown(self, now_ms: int) -> float:
+        if not self.duration_ms:
+            return 0.0
+        return min(max(1.0 - (now_ms - self.start_ms) / self.duration_ms, 0.0), 1.0)
@@ -1,12 +1,24 @@
 from Board import Board
-from Physics import Physics
+from Physics import Physics, IdlePhysics, MovePhysics, JumpPhysics, RestPhysics
+
+
+REST_MS = {"long_rest": 2000, "short_rest": 1000}   # when config.json has no "duration_ms"
 
 
 class PhysicsFactory:      # very light for now
     def __init__(self, board: Board): 
         """Initialize physics factory with board."""
-        pass
+        self.board = board
         
-    def create(self, start_cell, cfg) -> Physics:
+    def create(self, start_cell, cfg, state_name: str = "idle") -> Physics:
         """Create a physics object with the given configuration."""
-        pass 
\ No newline at end of file
+        speed = cfg.get("speed_m_per_sec", 0.0)
+        next_state = cfg.get("next_state_when_finished", "idle")
+        if state_name == "move":
+            return MovePhysics(start_cell, self.board, speed, next_state)
+        if state_name == "jump":
+            return JumpPhysics(start_cell, self.board, speed, next_state)
+        if state_name in REST_MS or "duration_ms" in cfg:
+            duration = cfg.get("duration_ms", REST_MS.get(state_name))
+            return RestPhysics(start_cell, self.board, speed, next_state, duration)
+        return IdlePhysics(start_cell, self.board, speed, next_state)
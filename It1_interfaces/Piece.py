@@ -1,31 +1,191 @@
+import math
+from typing import Optional
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
 from Board import Board
 from Command import Command
 from State import State
-import cv2
+from img import Img
+
+
+COOLDOWN_LEVELS = 16                 # quantisation of the cooldown shade
+COOLDOWN_BGRA = (40, 40, 40, 140)    # colour of the shade
+_MAX_CHAIN = 8                       # transitions `update` takes in one call, at most
+
+
+@lru_cache(maxsize=None)
+def cooldown_overlay(cell_w: int, cell_h: int, level: int) -> Img:
+    """Shade over the top `level / COOLDOWN_LEVELS` of a cell, built once per process."""
+    overlay = Img()
+    overlay.img = np.zeros((cell_h, cell_w, 4), np.uint8)
+    overlay.img[:round(cell_h * level / COOLDOWN_LEVELS)] = COOLDOWN_BGRA
+    return overlay
+
+
+# sprite frame -> {level: sprite with the shade already blended in}
+_shaded: "WeakKeyDictionary[Img, dict]" = WeakKeyDictionary()
+
+
+def _with_cooldown(sprite: Img, level: int) -> Img:
+    if level <= 0:
+        return sprite
+    per_level = _shaded.setdefault(sprite, {})
+    shaded = per_level.get(level)
+    if shaded is None:
+        h, w = sprite.img.shape[:2]
+        shaded = Img()
+        shaded.img = sprite.img.copy()
+        shaded.draw_batch([(0, 0, 0)], {0: cooldown_overlay(w, h, level)})
+        per_level[level] = shaded
+    return shaded
+
+
+def shaded_sprites() -> list:
+    """Every cooldown-shaded sprite currently cached."""
+    return [img for levels in list(_shaded.values()) for img in levels.values()]
+
+
+def clear_shaded():
+    """Drop the shaded sprites; they are rebuilt on demand."""
+    _shaded.clear()
 
 
 class Piece:
     def __init__(self, piece_id: str, init_state: State):
         """Initialize a piece with ID and initial state."""
+        self.piece_id = piece_id
         self._state = init_state
+        self.home = init_state._physics.cell   # starting cell, where "1st" moves are open
+        self._trail = []          # travel segments since the last `take_trail`
+        self._status = []         # (since ms, can be captured, can capture) since `take_status`
         pass
 
     def on_command(self, cmd: Command, now_ms: int):
         """Handle a command for this piece."""
         if self.is_command_possible(cmd):
-            self._state = self._state.process_command(cmd)
-            self._state.update(now_ms)
-        pass
+            self._state = self._state.process_command(cmd, now_ms)
+            self._note_travel()
+            self._note_status()
+            self.update(now_ms)
+
+    def is_command_possible(self, cmd: Command) -> bool:
+        """Whether the current state would accept `cmd` (see `State.can_accept`)."""
+        return self._state.can_accept(cmd)
 
     def reset(self, start_ms: int):
-        self._state.reset()
         """Reset the piece to idle state."""
-        pass
+        self._state.reset(Command(start_ms, self.piece_id, "idle", [self._state._physics.cell]))
+        self._status = []
+        self._note_status()
 
     def update(self, now_ms: int):
-        """Update the piece state based on current time."""
-        pass
+        """
+        Update the piece state based on current time, taking every
+        transition due by then (a move and the rest after it can both end
+        within one coarse step).
+        """
+        for _ in range(_MAX_CHAIN):
+            self._note_travel()
+            state = self._state.update(now_ms)
+            if state is self._state:
+                break
+            self._state = state
+            self._note_status()
+
+    @property
+    def cell(self) -> tuple[int, int]:
+        """Board cell the piece is at (its start cell while it travels)."""
+        return self._state._physics.cell
+
+    def path(self):
+        """Current travel segment (see `Physics.path`)."""
+        return self._state._physics.path()
+
+    def snapshot(self) -> tuple:
+        """Compact copy of what the simulation changes (see `restore`)."""
+        state = self._state
+        return state, state._cmd, state._graphics.start_ms, state._physics.snapshot()
+
+    def restore(self, snap: tuple):
+        """Put the piece back to a `snapshot`, state machine position included."""
+        state, cmd, graphics_start, physics = snap
+        self._state = state
+        state._cmd = cmd
+        state._graphics.start_ms = graphics_start
+        state._physics.restore(physics)
+        self._trail = []
+        self._status = []
+        self._note_status()
+
+    def take_trail(self) -> list:
+        """
+        Every travel segment the piece was on since the last call, even one
+        a coarse step started and finished at once.
+        """
+        self._note_travel()
+        trail, self._trail = self._trail, []
+        return trail
+
+    def take_status(self) -> list:
+        """
+        (since ms, can be captured, can capture) for every state the piece
+        was in since the last call, oldest first; the current one stays.
+        """
+        status, self._status = self._status, self._status[-1:]
+        return status
+
+    def _note_status(self):
+        physics = self._state._physics
+        self._status.append((physics.start_ms, physics.can_be_captured(), physics.can_capture()))
+
+    def _note_travel(self):
+        path = self.path()
+        if path is not None and path not in self._trail:
+            self._trail.append(path)
+
+    @property
+    def state_name(self) -> str:
+        return self._state.name
+
+    def get_moves(self) -> list[tuple[int, int]]:
+        """Cells the piece's move table allows from its current cell."""
+        r, c = self.cell
+        return self._state._moves.get_moves(r, c)
+
+    def view_at(self, now_ms: int) -> tuple[int, int, int, int]:
+        """What `sprite_at` shows, as numbers: (frame index, shade level, x, y)."""
+        physics = self._state._physics
+        level = math.ceil(physics.cooldown(now_ms) * COOLDOWN_LEVELS)
+        x, y = physics.get_pos()
+        return self._state._graphics.frame_index(now_ms), level, x, y
+
+    def sprite_at(self, now_ms: int) -> tuple[Img, int, int]:
+        """Current sprite (cooldown shade included) and its pixel position."""
+        frame, level, x, y = self.view_at(now_ms)
+        return _with_cooldown(self._state._graphics.frames[frame], level), x, y
+
+    def next_frame_ms(self, now_ms: int) -> Optional[int]:
+        """
+        Game time at which `sprite_at` may next return something different
+        (None = not until a command arrives).
+        """
+        physics = self._state._physics
+        if physics.is_moving():
+            return now_ms
+        times = [self._state._graphics.next_change_ms(now_ms)]
+        if physics.duration_ms is not None:
+            end = physics.start_ms + physics.duration_ms
+            times.append(end)
+            if physics.cooldown(now_ms) > 0:           # next shade level
+                step = (now_ms - physics.start_ms) * COOLDOWN_LEVELS // physics.duration_ms + 1
+                times.append(physics.start_ms + -(-step * physics.duration_ms // COOLDOWN_LEVELS))
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
 
     def draw_on_board(self, board, now_ms: int):
         """Draw the piece on the board with cooldown overlay."""
-        pass
+        sprite, x, y = self.sprite_at(now_ms)
+        board.img.draw_batch([(0, x, y)], {0: sprite})
@@ -1,11 +1,14 @@
 import pathlib
-from typing import Dict, Tuple
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from weakref import WeakSet
 import json
 from Board import Board
 from GraphicsFactory import GraphicsFactory
 from Moves import Moves
 from PhysicsFactory import PhysicsFactory
 from Piece import Piece
+from SetupLoader import InvalidSetup, load_board
 from State import State
 
 
@@ -13,13 +16,188 @@ class PieceFactory:
     def __init__(self, board: Board, pieces_root: pathlib.Path):
         """Initialize piece factory with board and 
         generates the library of piece templates from the pieces directory.."""
-        pass
+        self.board = board
+        self.pieces_root = pathlib.Path(pieces_root)
+        self.graphics_factory = GraphicsFactory(board)
+        self.physics_factory = PhysicsFactory(board)
+        self._moves: Dict[str, Moves] = {}                    # piece type -> rules
+        self._configs: Dict[Tuple[str, str], dict] = {}       # (type, state) -> config.json
+        self._live: Dict[Tuple[str, str], WeakSet] = defaultdict(WeakSet)
+        self._count: Dict[str, int] = defaultdict(int)
 
-    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
+        for piece_dir in sorted(self.pieces_root.iterdir()):
+            if (piece_dir / "moves.txt").is_file():
+                self._moves[piece_dir.name] = self._read_moves(piece_dir)
+                for state_dir in sorted((piece_dir / "states").iterdir()):
+                    self._configs[piece_dir.name, state_dir.name] = \
+                        json.loads((state_dir / "config.json").read_text())
+
+    def _read_moves(self, piece_dir: pathlib.Path) -> Moves:
+        return Moves(piece_dir / "moves.txt", (self.board.H_cells, self.board.W_cells))
+
+    def _build_state_machine(self, piece_dir: pathlib.Path,
+                             cell: Tuple[int, int] = (0, 0)) -> State:
         """Build a state machine for a piece from its directory."""
-        pass
+        p_type = piece_dir.name
+        cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
+        states: Dict[str, State] = {}
+        for (t, name), cfg in self._configs.items():
+            if t != p_type:
+                continue
+            graphics = self.graphics_factory.load(piece_dir / "states" / name / "sprites",
+                                                  cfg.get("graphics", {}), cell_size)
+            physics = self.physics_factory.create(cell, cfg.get("physics", {}), name)
+            states[name] = State(self._moves[p_type], graphics, physics, name)
+            self._live[p_type, name].add(states[name])
+
+        for name, state in states.items():
+            nxt = self._configs[p_type, name].get("physics", {}).get("next_state_when_finished")
+            if nxt in states:
+                state.set_transition(nxt, states[nxt])
+        if "idle" in states:
+            for event, name in (("Move", "move"), ("Jump", "jump")):
+                if name in states:
+                    states["idle"].set_transition(event, states[name])
+        return states["idle"]
 
     # PieceFactory.py  – replace create_piece(...)
     def create_piece(self, p_type: str, cell: Tuple[int, int]) -> Piece:
         """Create a piece of the specified type at the given cell."""
-        pass 
\ No newline at end of file
+        piece_id = f"{p_type}_{self._count[p_type]}"
+        self._count[p_type] += 1
+        return Piece(piece_id, self._build_state_machine(self.pieces_root / p_type, cell))
+
+    def create_board_pieces(self, csv_path: pathlib.Path) -> List[Piece]:
+        """Create every piece of a board.csv setup (one piece type per cell).
+
+        Piece ids are numbered from 0 for every board, so repeated games
+        reuse the same ids.  The setup must be as big as the board.
+        """
+        setup = load_board(csv_path, known=self._moves)
+        board_dims = (self.board.H_cells, self.board.W_cells)
+        if tuple(setup.dims) != board_dims:
+            raise InvalidSetup(f"{csv_path}: setup is {setup.dims[0]}x{setup.dims[1]} cells, "
+                               f"board is {board_dims[0]}x{board_dims[1]}")
+        self._count.clear()
+        return [self.create_piece(kind, (row, col))
+                for kind, row, col in setup.placements.tolist()]
+
+    # ─── hot reload ─────────────────────────────────────────────────────────
+    def reload(self, paths: Iterable[pathlib.Path],
+               on_error: Optional[Callable[[pathlib.Path, Exception], None]] = None
+               ) -> List[Callable[[], None]]:
+        """
+        Rebuild what depends on the changed `paths` (files under
+        `pieces_root`) and return the swaps that install it.
+
+        The expensive part (parsing, decoding sprites) happens here; each
+        returned swap only rebinds attributes, so the game loop can run
+        them between two frames.  Untouched piece types, states and
+        sprite folders are left as they are.
+
+        A file that fails to load (say, caught half-written) raises, or
+        with `on_error` set is reported there, once per path that fed it,
+        while the other changes still go through.
+        """
+        builds: Dict[tuple, Callable[[], Callable[[], None]]] = {}
+        fed: Dict[tuple, List[pathlib.Path]] = defaultdict(list)
+        for path in paths:
+            rel = pathlib.Path(path).resolve().relative_to(self.pieces_root.resolve()).parts
+            if not rel or rel[0] not in self._moves:
+                continue
+            p_type = rel[0]
+            if rel[1:] == ("moves.txt",):
+                target = ("moves", p_type)
+                builds[target] = lambda p_type=p_type: self._swap_moves(
+                    p_type, self._read_moves(self.pieces_root / p_type))
+            elif len(rel) >= 4 and rel[1] == "states" and (p_type, rel[2]) in self._configs:
+                key = (p_type, rel[2])
+                state_dir = self.pieces_root.joinpath(*rel[:3])
+                if rel[3] == "config.json":
+                    target = ("config", key)
+                    builds[target] = lambda key=key, state_dir=state_dir: self._swap_config(
+                        key, json.loads((state_dir / "config.json").read_text()))
+                elif rel[3] == "sprites":
+                    target = ("sprites", key)
+                    builds[target] = lambda key=key, state_dir=state_dir: self._swap_sprites(
+                        key, state_dir / "sprites")
+                else:
+                    continue
+            else:
+                continue
+            fed[target].append(pathlib.Path(path))
+
+        swaps: List[Callable[[], None]] = []
+        for target, build in builds.items():
+            try:
+                swaps.append(build())
+            except Exception as exc:
+                if on_error is None:
+                    raise
+                for path in fed[target]:
+                    on_error(path, exc)
+        return swaps
+
+    def _swap_moves(self, p_type: str, moves: Moves) -> Callable[[], None]:
+        def swap():
+            self._moves[p_type] = moves
+            for name in [n for t, n in self._live if t == p_type]:
+                for state in list(self._live[p_type, name]):
+                    state._moves = moves
+        return swap
+
+    def _swap_config(self, key: Tuple[str, str], cfg: dict) -> Callable[[], None]:
+        physics_cfg, graphics_cfg = cfg.get("physics", {}), cfg.get("graphics", {})
+        nxt = physics_cfg.get("next_state_when_finished")
+        if nxt is not None and (key[0], nxt) not in self._configs:
+            raise ValueError(f"{key[0]}/{key[1]}: unknown next_state_when_finished {nxt!r}")
+
+        def swap():
+            self._configs[key] = cfg
+            for state in list(self._live[key]):
+                physics, graphics = state._physics, state._graphics
+                physics.speed = physics_cfg.get("speed_m_per_sec", physics.speed)
+                target = _machine(state).get(nxt) if nxt != physics.next_state else None
+                if target is not None:
+                    # the event the state fires when it ends is also its transition
+                    state.transitions.pop(physics.next_state, None)
+                    state.set_transition(nxt, target)
+                    physics.next_state = nxt
+                if "duration_ms" in physics_cfg:
+                    physics.duration_ms = physics_cfg["duration_ms"]
+                graphics.set_timing(graphics_cfg.get("frames_per_sec", graphics.fps),
+                                    graphics_cfg.get("is_loop", graphics.loop))
+        return swap
+
+    def _swap_sprites(self, key: Tuple[str, str],
+                      sprites_dir: pathlib.Path) -> Callable[[], None]:
+        def size_of(graphics) -> Tuple[int, int]:
+            if not graphics.frames:
+                return self.board.cell_W_pix, self.board.cell_H_pix
+            h, w = graphics.frames[0].img.shape[:2]
+            return w, h
+
+        sizes = {size_of(state._graphics) for state in list(self._live[key])}
+        paths, _ = self.graphics_factory.reload(
+            sprites_dir, next(iter(sizes), (self.board.cell_W_pix, self.board.cell_H_pix)))
+        frames = {size: [self.graphics_factory.get_frame(p, size) for p in paths]
+                  for size in sizes}
+
+        def swap():
+            for state in list(self._live[key]):
+                size = size_of(state._graphics)
+                if size not in frames:
+                    frames[size] = [self.graphics_factory.get_frame(p, size) for p in paths]
+                state._graphics.set_frames(frames[size], paths)
+        return swap
+
+
+def _machine(state: State) -> Dict[str, State]:
+    """Every state of the piece `state` belongs to, by name."""
+    found, stack = {}, [state]
+    while stack:
+        s = stack.pop()
+        if s.name not in found:
+            found[s.name] = s
+            stack.extend(s.transitions.values())
+    return found
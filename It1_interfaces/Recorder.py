@@ -0,0 +1,104 @@
+import multiprocessing as mp
+import pathlib
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+
+from img import Img, cv2
+
+
+def _encode(shm_name: str, shape: Tuple[int, ...], path: str, fps: float, fourcc: str,
+            ready, free, written):
+    """
+    Encoder process: write ring slots to `path` in the order they are
+    handed over, each as many times as it was pushed.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(shape, np.uint8, buffer=shm.buf)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps,
+                             (shape[2], shape[1]))
+    try:
+        while (msg := ready.get()) is not None:
+            slot, times = msg
+            for _ in range(times):
+                writer.write(ring[slot])
+            free.release()
+            with written.get_lock():
+                written.value += times
+    finally:
+        writer.release()
+        del ring
+        shm.close()
+
+
+class Recorder:
+    """
+    Records game frames to a video file without slowing the game loop.
+
+    Frames are copied into a ring of `slots` BGR buffers in shared memory;
+    only the slot index crosses the process boundary, and a background
+    process encodes them with `cv2.VideoWriter`.  When the encoder falls
+    behind and the ring is full, `push` drops the frame instead of waiting
+    and the next frame that fits is written in its place as well, so the
+    video keeps one frame per push and plays at the game's speed.
+    """
+
+    def __init__(self, path: str | pathlib.Path, frame_size: Tuple[int, int],
+                 fps: float = 30.0, slots: int = 8, fourcc: str = "mp4v"):
+        w, h = frame_size
+        self.fps = fps
+        self.shape = (slots, h, w, 3)
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * h * w * 3)
+        self._ring = np.ndarray(self.shape, np.uint8, buffer=self._shm.buf)
+        self._head = 0
+        self.pushed = 0
+        self.dropped = 0
+        self._owed = 0          # dropped frames the next pushed frame stands in for
+
+        ctx = mp.get_context()
+        self._ready = ctx.SimpleQueue()
+        self._free = ctx.Semaphore(slots)
+        self._written = ctx.Value("q", 0)
+        self._proc = ctx.Process(target=_encode, daemon=True,
+                                 args=(self._shm.name, self.shape, str(path), fps, fourcc,
+                                       self._ready, self._free, self._written))
+        self._proc.start()
+
+    def push(self, frame: Img) -> bool:
+        """Queue one frame for encoding; returns False if it was dropped."""
+        if not self._free.acquire(block=False):
+            self.dropped += 1
+            self._owed += 1
+            return False
+
+        src, dst = frame.img, self._ring[self._head]
+        if src.shape[:2] != dst.shape[:2]:
+            src = cv2.resize(src, (dst.shape[1], dst.shape[0]))
+        if src.ndim == 3 and src.shape[2] == 4:
+            cv2.cvtColor(src, cv2.COLOR_BGRA2BGR, dst=dst)
+        else:
+            dst[...] = src
+
+        self._ready.put((self._head, 1 + self._owed))
+        self._owed = 0
+        self._head = (self._head + 1) % self.shape[0]
+        self.pushed += 1
+        return True
+
+    def stats(self) -> dict:
+        """Frames pushed, encoded so far and dropped."""
+        return {"pushed": self.pushed, "written": self._written.value, "dropped": self.dropped}
+
+    def close(self) -> dict:
+        """Flush the ring, stop the encoder and free the shared memory."""
+        if self._owed and self.pushed:      # repeat the last frame handed over
+            self._free.acquire()
+            self._ready.put(((self._head - 1) % self.shape[0], self._owed))
+            self._owed = 0
+        self._ready.put(None)
+        self._proc.join()
+        del self._ring
+        self._shm.close()
+        self._shm.unlink()
+        return self.stats()
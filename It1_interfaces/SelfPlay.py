@@ -0,0 +1,201 @@
+"""
+Headless self-play between random agents, for balance analytics.
+
+Games run in a process pool.  Every sampled position and every issued
+`Command` is appended to fixed-schema rows that are flushed to `.npy`
+shards of at most `rows_per_shard` rows, so memory stays bounded however
+many games are played.  Read the shards back with `load_shards`, which
+memory-maps them.
+
+The board background and every sprite are decoded once by the parent and
+shared with the workers read-only (`SharedAssets`).
+"""
+import multiprocessing as mp
+import pathlib
+import random
+from typing import List, Optional
+
+import numpy as np
+
+from Board import Board
+from Command import Command
+from Game import Game
+from img import Img
+from PieceFactory import PieceFactory
+from SharedAssets import SharedAssets
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+STATE_NAMES = ["idle", "move", "jump", "long_rest", "short_rest"]
+
+# one row per (game, sample time, piece)
+POSITION = np.dtype([("game", "<u4"), ("t_ms", "<i8"), ("piece", "u1"),
+                     ("kind", "u1"), ("row", "u1"), ("col", "u1"), ("state", "u1")])
+# one row per issued command; type is a COMMAND_TYPES code, squares as square_code
+COMMAND = np.dtype([("game", "<u4"), ("t_ms", "<i8"), ("piece", "u1"),
+                    ("type", "u1"), ("src", "u1"), ("dst", "u1")])
+
+
+class ShardWriter:
+    """Buffers rows of one dtype and writes them out as numbered .npy shards."""
+
+    def __init__(self, out_dir: pathlib.Path, prefix: str, dtype: np.dtype,
+                 rows_per_shard: int = 1 << 16):
+        self.out_dir = pathlib.Path(out_dir)
+        self.prefix = prefix
+        self._buf = np.empty(rows_per_shard, dtype)
+        self._n = 0
+        self._shard = 0
+
+    def append(self, row: tuple):
+        self._buf[self._n] = row
+        self._n += 1
+        if self._n == len(self._buf):
+            self.flush()
+
+    def flush(self):
+        if self._n:
+            np.save(self.out_dir / f"{self.prefix}-{self._shard:05d}.npy", self._buf[:self._n])
+            self._shard += 1
+            self._n = 0
+
+
+def load_shards(out_dir: pathlib.Path, table: str) -> List[np.ndarray]:
+    """Memory-map every shard of `table` ("positions" or "commands")."""
+    return [np.load(p, mmap_mode="r")
+            for p in sorted(pathlib.Path(out_dir).glob(f"{table}-*.npy"))]
+
+
+class RandomAgent:
+    """Every `think_ms` picks a random idle piece of its colour and a random legal move."""
+
+    def __init__(self, color: str, rng: random.Random, think_ms: int = 250):
+        self.color = color
+        self.rng = rng
+        self.think_ms = think_ms
+        self._next_ms = 0
+
+    def act(self, game: Game, now_ms: int) -> Optional[Command]:
+        if now_ms < self._next_ms:
+            return None
+        self._next_ms = now_ms + self.think_ms
+        mine = [p for p in game.pieces.values()
+                if p.piece_id.split("_")[0].endswith(self.color) and p.state_name == "idle"]
+        self.rng.shuffle(mine)
+        for piece in mine:
+            targets = game.attack_map.legal_moves(piece.piece_id)
+            if targets:
+                board = game.board
+                return Command(now_ms, piece.piece_id, "Move",
+                               [board.to_square(piece.cell), board.to_square(self.rng.choice(targets))])
+        return None
+
+
+# ─── worker side ────────────────────────────────────────────────────────────
+CELL_PIX = 64
+_assets: Optional[SharedAssets] = None
+_factory: Optional[PieceFactory] = None
+
+
+def _make_factory(board_img: Img) -> PieceFactory:
+    board = Board(cell_H_pix=CELL_PIX, cell_W_pix=CELL_PIX, cell_H_m=1, cell_W_m=1,
+                  W_cells=8, H_cells=8, img=board_img)
+    return PieceFactory(board, ROOT / "pieces")
+
+
+def _attach_assets(manifest: dict):
+    """Pool initializer: map the parent's board and sprites read-only."""
+    global _assets
+    _assets = SharedAssets.attach(manifest)
+
+
+def _worker_factory() -> PieceFactory:
+    """One PieceFactory per worker process, so rules load once and sprites never."""
+    global _factory
+    if _factory is None:
+        if _assets is not None:
+            _factory = _make_factory(_assets.board)
+            _factory.graphics_factory.adopt(_assets.sprites)
+        else:
+            _factory = _make_factory(Img())
+    return _factory
+
+
+def _publish_assets() -> SharedAssets:
+    """Decode the board and every sprite a game uses, into shared memory."""
+    factory = _make_factory(Img().read(ROOT / "board.png", (8 * CELL_PIX, 8 * CELL_PIX)))
+    factory.create_board_pieces(ROOT / "pieces" / "board.csv")
+    return SharedAssets.publish(factory.board.img, factory.graphics_factory.cached_frames(),
+                                channels=factory.board.img.img.shape[2])
+
+
+def _play_chunk(args) -> int:
+    """Play games [first, first + count) and write them as one shard series."""
+    out_dir, first, count, duration_ms, step_ms, sample_ms, rows_per_shard = args
+    factory = _worker_factory()
+    kinds = sorted(factory._moves)
+    positions = ShardWriter(out_dir, f"positions-{first:08d}", POSITION, rows_per_shard)
+    commands = ShardWriter(out_dir, f"commands-{first:08d}", COMMAND, rows_per_shard)
+
+    for game_id in range(first, first + count):
+        rng = random.Random(game_id)
+        game = Game(factory.create_board_pieces(ROOT / "pieces" / "board.csv"), factory.board)
+        index = {pid: i for i, pid in enumerate(game.pieces)}
+        agents = [RandomAgent("W", rng), RandomAgent("B", rng)]
+        for p in game.pieces.values():
+            p.reset(0)
+
+        for now in range(0, duration_ms + 1, step_ms):
+            for agent in agents:
+                cmd = agent.act(game, now)
+                if cmd is not None:
+                    game.user_input_queue.put(cmd)
+                    src, dst = cmd.squares()
+                    commands.append((game_id, now, index[cmd.piece_id], cmd.type_code, src, dst))
+            game.step(now)
+            if now % sample_ms == 0:
+                for pid, p in game.pieces.items():
+                    r, c = p.cell
+                    positions.append((game_id, now, index[pid],
+                                      kinds.index(pid.split("_")[0]), r, c,
+                                      STATE_NAMES.index(p.state_name)))
+            if game._is_win():
+                break
+
+    positions.flush()
+    commands.flush()
+    return count
+
+
+def run_selfplay(out_dir: pathlib.Path, n_games: int, workers: Optional[int] = None,
+                 games_per_task: int = 8, duration_ms: int = 60_000, step_ms: int = 20,
+                 sample_ms: int = 100, rows_per_shard: int = 1 << 16) -> int:
+    """Play `n_games` across a process pool, writing shards to `out_dir`."""
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(out_dir, first, min(games_per_task, n_games - first),
+              duration_ms, step_ms, sample_ms, rows_per_shard)
+             for first in range(0, n_games, games_per_task)]
+    assets = _publish_assets()
+    try:
+        with mp.Pool(workers, initializer=_attach_assets, initargs=(assets.manifest,)) as pool:
+            return sum(pool.imap_unordered(_play_chunk, tasks))
+    finally:
+        assets.close()
+
+
+def main():
+    import argparse         # CLI only; workers import this module too
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir", type=pathlib.Path)
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--duration-ms", type=int, default=60_000)
+    args = parser.parse_args()
+    played = run_selfplay(args.out_dir, args.games, args.workers, duration_ms=args.duration_ms)
+    rows = sum(len(s) for s in load_shards(args.out_dir, "positions"))
+    print(f"{played} games, {rows} position rows in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import hashlib
+import math
+import pathlib
+from collections import defaultdict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+MOVE_TAGS = ("capture", "non_capture", "1st")
+
+# one row per piece on the board
+PLACEMENT = np.dtype([("kind", "U8"), ("row", "<u2"), ("col", "<u2")])
+
+
+class InvalidSetup(Exception): ...
+
+
+class CompiledMoves(NamedTuple):
+    offsets: np.ndarray                 # (n, 2) int8, deduplicated, file order
+    tags: Dict[Tuple[int, int], str]    # offset -> "capture" | "non_capture" | "1st"
+    table: tuple                        # [r][c] -> destination cells
+    legal: tuple                        # [r][c] -> frozenset of the same
+    rays: tuple                         # [r][c] -> rays of ((cell), tag), nearest first
+
+
+class CompiledBoard(NamedTuple):
+    dims: Tuple[int, int]               # (rows, cols)
+    placements: np.ndarray              # PLACEMENT rows
+
+
+# (kind, content hash, extra key) -> compiled form
+_cache: Dict[tuple, object] = {}
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _read(path: pathlib.Path) -> Tuple[bytes, str]:
+    data = pathlib.Path(path).read_bytes()
+    return data, hashlib.sha1(data).hexdigest()
+
+
+# ─── moves.txt ──────────────────────────────────────────────────────────────
+def parse_moves(text: str, source: str = "moves.txt"):
+    """`dr,dc[:tag]` lines -> (deduplicated offsets, tags)."""
+    offsets, tags = [], {}
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        delta, _, tag = line.partition(":")
+        try:
+            dr, dc = (int(v) for v in delta.split(","))
+        except ValueError:
+            raise InvalidSetup(f"{source}:{n}: expected 'dr,dc[:tag]', got {line!r}") from None
+        if (dr, dc) == (0, 0):
+            raise InvalidSetup(f"{source}:{n}: offset 0,0 is not a move")
+        tag = tag.strip()
+        if tag and tag not in MOVE_TAGS:
+            raise InvalidSetup(f"{source}:{n}: unknown tag {tag!r} (expected one of {MOVE_TAGS})")
+        if (dr, dc) in tags or (dr, dc) in offsets:
+            if tags.get((dr, dc), "") != tag:
+                raise InvalidSetup(f"{source}:{n}: offset {dr},{dc} listed with another tag")
+            continue
+        offsets.append((dr, dc))
+        if tag:
+            tags[dr, dc] = tag
+    return offsets, tags
+
+
+def compile_moves(offsets, tags, dims: Tuple[int, int]) -> CompiledMoves:
+    rows, cols = dims
+    table = tuple(tuple(tuple((r + dr, c + dc) for dr, dc in offsets
+                              if 0 <= r + dr < rows and 0 <= c + dc < cols)
+                        for c in range(cols))
+                  for r in range(rows))
+    legal = tuple(tuple(frozenset(cells) for cells in row) for row in table)
+
+    # offsets sharing a direction form a ray, nearest first: (2,0) is
+    # only reachable through (1,0) when both are listed
+    by_dir = defaultdict(list)
+    for dr, dc in offsets:
+        g = math.gcd(dr, dc)
+        by_dir[dr // g, dc // g].append((g, dr, dc))
+    rays = [sorted(ray) for ray in by_dir.values()]
+    ray_table = tuple(tuple(tuple(ray for ray in (
+                                tuple(((r + dr, c + dc), tags.get((dr, dc), ""))
+                                      for _, dr, dc in steps
+                                      if 0 <= r + dr < rows and 0 <= c + dc < cols)
+                                for steps in rays) if ray)
+                            for c in range(cols))
+                      for r in range(rows))
+
+    return CompiledMoves(np.array(offsets, np.int8).reshape(-1, 2), tags, table, legal, ray_table)
+
+
+def load_moves(path: pathlib.Path, dims: Tuple[int, int]) -> CompiledMoves:
+    """Parsed and compiled `moves.txt`, reused for any file with the same content."""
+    data, digest = _read(path)
+    key = ("moves", digest, tuple(dims))
+    compiled = _cache.get(key)
+    if compiled is None:
+        offsets, tags = parse_moves(data.decode(), str(path))
+        compiled = _cache[key] = compile_moves(offsets, tags, dims)
+    return compiled
+
+
+# ─── board.csv ──────────────────────────────────────────────────────────────
+def parse_board(text: str, source: str = "board.csv",
+                known: Optional[Iterable[str]] = None) -> CompiledBoard:
+    """One CSV row per board row, each cell empty or a piece type ("PW")."""
+    known = None if known is None else set(known)
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise InvalidSetup(f"{source}: empty board")
+    cols = len(lines[0].split(","))
+    placements = []
+    for r, line in enumerate(lines):
+        cells = line.split(",")
+        if len(cells) != cols:
+            raise InvalidSetup(f"{source}:{r + 1}: {len(cells)} columns, expected {cols}")
+        for c, kind in enumerate(cells):
+            kind = kind.strip()
+            if not kind:
+                continue
+            if known is not None and kind not in known:
+                raise InvalidSetup(f"{source}:{r + 1}: unknown piece {kind!r} in column {c + 1}")
+            placements.append((kind, r, c))
+    return CompiledBoard((len(lines), cols), np.array(placements, PLACEMENT))
+
+
+def load_board(path: pathlib.Path, known: Optional[Iterable[str]] = None) -> CompiledBoard:
+    """Parsed and validated `board.csv`, reused for any file with the same content."""
+    data, digest = _read(path)
+    key = ("board", digest, None if known is None else frozenset(known))
+    compiled = _cache.get(key)
+    if compiled is None:
+        compiled = _cache[key] = parse_board(data.decode(), str(path), known)
+    return compiled
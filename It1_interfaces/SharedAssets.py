@@ -0,0 +1,85 @@
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+from img import Img, cv2
+
+
+def _with_channels(img: Img, channels: Optional[int]) -> Img:
+    have = img.img.shape[2] if img.img.ndim == 3 else 1
+    if channels is None or have == channels:
+        return img
+    arr = img.img if have > 1 else cv2.cvtColor(img.img, cv2.COLOR_GRAY2BGR)
+    if arr.shape[2] != channels:
+        arr = cv2.cvtColor(arr, cv2.COLOR_BGR2BGRA if channels == 4 else cv2.COLOR_BGRA2BGR)
+    out = Img()
+    out.img = arr
+    return out
+
+
+class SharedAssets:
+    """
+    Read-only pixels shared by every process of a game pool.
+
+    The parent packs the board background and a sprite atlas (any number
+    of keyed `Img`s) into one `multiprocessing.shared_memory` block with
+    `publish`, and hands the small, picklable `manifest` to its workers.
+    Workers `attach` and get `Img`s that are read-only views of that block,
+    so the only pixels a worker owns are its own mutable frame.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, manifest: dict, owner: bool):
+        self._shm = shm
+        self.manifest = manifest
+        self._owner = owner
+        self.board: Optional[Img] = None
+        self.sprites: Dict[Hashable, Img] = {}
+        for key, (offset, shape, dtype) in manifest["images"].items():
+            arr = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=offset)
+            arr.flags.writeable = False
+            img = Img()
+            img.img = arr
+            if key == "__board__":
+                self.board = img
+            else:
+                self.sprites[key] = img
+
+    @classmethod
+    def publish(cls, board: Optional[Img], sprites: Dict[Hashable, Img],
+                channels: Optional[int] = None) -> "SharedAssets":
+        """
+        Copy `board` and `sprites` into a new shared block (parent side).
+
+        With `channels` set (that of the canvas the workers draw on) the
+        sprites are stored with that many channels, so drawing them never
+        needs a converted private copy in the worker.
+        """
+        images = {key: _with_channels(img, channels) for key, img in sprites.items()}
+        if board is not None and board.img is not None:
+            images["__board__"] = board
+        layout, size = {}, 0
+        for key, img in images.items():
+            layout[key] = (size, img.img.shape, img.img.dtype.str)
+            size += -(-img.img.nbytes // 64) * 64        # keep every image 64-byte aligned
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, img in images.items():
+            offset, shape, dtype = layout[key]
+            np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=offset)[...] = img.img
+        return cls(shm, {"name": shm.name, "images": layout}, owner=True)
+
+    @classmethod
+    def attach(cls, manifest: dict) -> "SharedAssets":
+        """Map a block published by another process (worker side)."""
+        return cls(shared_memory.SharedMemory(name=manifest["name"]), manifest, owner=False)
+
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def close(self):
+        """Drop the mapping; the publishing process also frees the block."""
+        self.board, self.sprites = None, {}
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,173 @@
+"""
+Spectator streaming: the server encodes what every piece looks like once
+per tick and hands the same bytes to every spectator, so the cost of an
+extra spectator is one send.
+
+Messages are length-prefixed binary.  A keyframe carries the roster
+(piece ids and state names) and every piece; a delta carries only the
+pieces whose cell, state, animation frame, shade or position changed
+since the previous message.  A keyframe goes out every `keyframe_every`
+messages and whenever the roster changes; late joiners get the last
+keyframe and the deltas after it.
+
+`SpectatorClient` decodes the stream and renders it with the normal
+`Img` / `GraphicsFactory` stack.
+"""
+import json
+import pathlib
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Board import Board
+from GraphicsFactory import GraphicsFactory
+from Piece import Piece, _with_cooldown
+
+
+# one piece as seen by a spectator; 11 bytes on the wire
+VIEW = np.dtype([("piece", "<u2"), ("state", "u1"), ("frame", "u1"), ("shade", "u1"),
+                 ("row", "u1"), ("col", "u1"), ("x", "<u2"), ("y", "<u2")])
+HEADER = struct.Struct("<IBqH")      # total length, kind, game time ms, rows
+KEYFRAME, DELTA = 0, 1
+
+
+class InvalidStream(Exception): ...
+
+
+# ─── server side ──────────────────────────────────────────────────────────
+class SpectatorFeed:
+    def __init__(self, keyframe_every: int = 60):
+        """Encode game state for spectators; see the module docstring."""
+        self.keyframe_every = keyframe_every
+        self._subscribers: List[Callable[[bytes], None]] = []
+        self._roster: List[str] = []
+        self._states: List[str] = []
+        self._prev: Optional[np.ndarray] = None
+        self._backlog: List[bytes] = []     # last keyframe + deltas since
+        self.stats = {"keyframes": 0, "deltas": 0, "bytes": 0}
+
+    def subscribe(self, send: Callable[[bytes], None]):
+        """Add a spectator; `send` gets whole messages (e.g. `sock.sendall`)."""
+        for msg in self._backlog:
+            send(msg)
+        self._subscribers.append(send)
+
+    def unsubscribe(self, send: Callable[[bytes], None]):
+        self._subscribers.remove(send)
+
+    def tick(self, pieces: Dict[str, Piece], now_ms: int) -> Optional[bytes]:
+        """Encode the pieces at `now_ms` and send it; None when nothing changed."""
+        if list(pieces) != self._roster:
+            self._roster = list(pieces)
+            self._prev = None
+        views = self._snapshot(pieces, now_ms)
+
+        if self._prev is None or len(self._backlog) >= self.keyframe_every:
+            msg = self._keyframe(views, now_ms)
+            self._backlog = [msg]
+            self.stats["keyframes"] += 1
+        else:
+            changed = views[views != self._prev]
+            if not len(changed):
+                return None
+            msg = HEADER.pack(HEADER.size + changed.nbytes, DELTA, now_ms, len(changed)) \
+                + changed.tobytes()
+            self._backlog.append(msg)
+            self.stats["deltas"] += 1
+        self._prev = views
+        self.stats["bytes"] += len(msg)
+        for send in self._subscribers:
+            send(msg)
+        return msg
+
+    def _snapshot(self, pieces: Dict[str, Piece], now_ms: int) -> np.ndarray:
+        views = np.zeros(len(self._roster), VIEW)
+        for i, pid in enumerate(self._roster):
+            p = pieces[pid]
+            if p.state_name not in self._states:
+                self._states.append(p.state_name)
+                self._prev = None            # new name -> resend the tables
+            frame, shade, x, y = p.view_at(now_ms)
+            views[i] = (i, self._states.index(p.state_name), frame, shade,
+                        *p.cell, x, y)
+        return views
+
+    def _keyframe(self, views: np.ndarray, now_ms: int) -> bytes:
+        tables = json.dumps({"pieces": self._roster, "states": self._states}).encode()
+        body = struct.pack("<H", len(tables)) + tables + views.tobytes()
+        return HEADER.pack(HEADER.size + len(body), KEYFRAME, now_ms, len(views)) + body
+
+
+# ─── client side ──────────────────────────────────────────────────────────
+class SpectatorClient:
+    def __init__(self, board: Board, pieces_root: pathlib.Path,
+                 graphics_factory: Optional[GraphicsFactory] = None):
+        """Rebuild the game picture from a `SpectatorFeed` stream."""
+        self.board = board
+        self.pieces_root = pathlib.Path(pieces_root)
+        self.graphics_factory = graphics_factory or GraphicsFactory(board)
+        self.pieces: List[str] = []
+        self.states: List[str] = []
+        self.views: Optional[np.ndarray] = None   # None until the first keyframe
+        self.now_ms = 0
+        self._buf = bytearray()
+        self._frames: Dict[Tuple[str, str], list] = {}
+
+    def feed(self, data: bytes) -> int:
+        """Take bytes as they arrive (any split); return messages applied."""
+        self._buf += data
+        n = 0
+        while len(self._buf) >= HEADER.size:
+            length = HEADER.unpack_from(self._buf)[0]
+            if len(self._buf) < length:
+                break
+            self.apply(bytes(self._buf[:length]))
+            del self._buf[:length]
+            n += 1
+        return n
+
+    def apply(self, msg: bytes):
+        """Apply one whole message."""
+        length, kind, now_ms, rows = HEADER.unpack_from(msg)
+        off = HEADER.size
+        if kind == KEYFRAME:
+            (n,) = struct.unpack_from("<H", msg, off)
+            tables = json.loads(msg[off + 2: off + 2 + n])
+            self.pieces, self.states = tables["pieces"], tables["states"]
+            self.views = np.frombuffer(msg, VIEW, rows, off + 2 + n).copy()
+        elif kind == DELTA:
+            if self.views is None:
+                return                       # joined mid-stream: wait for a keyframe
+            changed = np.frombuffer(msg, VIEW, rows, off)
+            self.views[changed["piece"]] = changed
+        else:
+            raise InvalidStream(f"unknown message kind {kind}")
+        self.now_ms = now_ms
+
+    def cell_of(self, piece_id: str) -> Tuple[int, int]:
+        v = self.views[self.pieces.index(piece_id)]
+        return int(v["row"]), int(v["col"])
+
+    def render(self) -> Board:
+        """Draw the last applied state on a copy of the board."""
+        frame = self.board.clone()
+        if self.views is None:
+            return frame
+        sprites, placements = {}, []
+        for v in self.views.tolist():
+            i, state, idx, shade, _, _, x, y = v
+            frames = self._state_frames(self.pieces[i].split("_")[0], self.states[state])
+            sprites[i] = _with_cooldown(frames[idx], shade)
+            placements.append((i, x, y))
+        frame.img.draw_batch(placements, sprites)
+        return frame
+
+    def _state_frames(self, kind: str, state: str) -> list:
+        frames = self._frames.get((kind, state))
+        if frames is None:
+            graphics = self.graphics_factory.load(
+                self.pieces_root / kind / "states" / state / "sprites", {},
+                (self.board.cell_W_pix, self.board.cell_H_pix))
+            frames = self._frames[kind, state] = graphics.frames
+        return frames
@@ -1,16 +1,21 @@
+from __future__ import annotations
+
 from Command import Command
 from Moves import Moves
 from Graphics import Graphics
 from Physics import Physics
-from State import State
 from typing import Dict
 import time
 
 
 class State:
-    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics):
+    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics,
+                 name: str = ""):
+        self.name = name            # state folder name, e.g. "long_rest"
+        self._moves = moves
         self._graphics = graphics
         self._physics = physics
+        self._cmd: Command | None = None
         self.transitions = {}
         """Initialize state with moves, graphics, and physics components."""
         pass
@@ -23,19 +28,37 @@ class State:
 
     def reset(self, cmd: Command):
         """Reset the state with a new command."""
-        self._graphics.reset()
-        self._physics.reset()
-        pass
+        self._cmd = cmd
+        self._graphics.reset(cmd)
+        self._physics.reset(cmd)
 
     def update(self, now_ms: int) -> State:
         """Update the state based on current time."""
-        self._graphics.reset(now_ms)
-        cmd = self._physics.reset(now_ms)
+        self._graphics.update(now_ms)
+        cmd = self._physics.update(now_ms)
         if cmd is not None:
-            return self.process_command(cmd)
+            return self.process_command(cmd, now_ms)
 
         return self
 
+    def can_accept(self, cmd: Command) -> bool:
+        """Cheap legality check done before `process_command`.
+
+        The state must have a transition for `cmd.type`, and a "Move" must
+        start from the piece's cell and land on a cell of the precomputed
+        move table for it.
+        """
+        if cmd.type not in self.transitions:
+            return False
+        if cmd.type == "Move":
+            if not cmd.params:
+                return False
+            board, (r, c) = self._physics.board, self._physics.cell
+            if len(cmd.params) > 1 and board.to_cell(cmd.params[0]) != (r, c):
+                return False
+            return self._moves.is_legal(r, c, board.to_cell(cmd.params[-1]))
+        return True
+
     def process_command(self, cmd: Command, now_ms: int) -> State:
         """Get the next state after processing a command."""
         # Command = QBMe5e8
@@ -43,11 +66,11 @@ class State:
         #     "Move" : state_move
         #     "Jump" : state_jmp
         # }
-        res = self.transitions[cmd.type]
+        res = self.transitions.get(cmd.type)
         if res is None:
-            return None
+            return self
 
-        res.reset(cmd.timestamp)
+        res.reset(cmd)
         return res
 
 
@@ -58,4 +81,4 @@ class State:
 
     def get_command(self) -> Command:
         """Get the current command for this state."""
-        pass
\ No newline at end of file
+        return self._cmd
@@ -2,9 +2,104 @@ from __future__ import annotations
 
 import pathlib
 
-import cv2
+from collections import OrderedDict
+
 import numpy as np
 
+from LazyModule import LazyModule
+
+cv2 = LazyModule("cv2")     # imported on first use: headless runs never need it
+
+TEXT_CACHE_SIZE = 256
+COPY, BLEND = 0, 1                  # how `draw_batch` treats a sprite rectangle
+RECT_COST_PX = 4096                 # fixed cost of drawing one rect, in blended pixels
+COPY_COST = 0.25                    # copying a pixel, relative to blending one
+_text_cache: "OrderedDict[tuple, tuple[Img, int, int]]" = OrderedDict()
+
+
+def text_sprite(txt: str, font_size: float, color: tuple, thickness: int = 1):
+    """
+    Rendered `txt` as a BGRA sprite plus the (dx, dy) of the text origin
+    inside it.  Results are kept in an LRU of `TEXT_CACHE_SIZE` entries keyed
+    by (text, font size, color, thickness).
+    """
+    key = (txt, font_size, color, thickness)
+    hit = _text_cache.get(key)
+    if hit is not None:
+        _text_cache.move_to_end(key)
+        return hit
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (w, h), baseline = cv2.getTextSize(txt, font, font_size, thickness)
+    pad = thickness + 1
+    mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), np.uint8)
+    cv2.putText(mask, txt, (pad, pad + h), font, font_size, 255, thickness, cv2.LINE_AA)
+
+    opacity = color[3] if len(color) > 3 else 255
+    sprite = Img()
+    sprite.img = np.empty(mask.shape + (4,), np.uint8)
+    sprite.img[..., :3] = color[:3]
+    sprite.img[..., 3] = (mask.astype(np.uint16) * opacity // 255).astype(np.uint8)
+
+    hit = _text_cache[key] = (sprite, pad, pad + h)
+    while len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return hit
+
+
+def _sprite_rects(alpha: np.ndarray) -> list[tuple[int, int, int, int, int]]:
+    """
+    Cover the visible pixels of `alpha` with (row0, row1, col0, col1, kind)
+    rectangles: COPY where every pixel is opaque, BLEND elsewhere, nothing
+    where every pixel is transparent.
+
+    Rows are taken in bands; in each band columns that are transparent on
+    every row are left out, and the widest run of columns opaque on every
+    row can become a COPY core between two BLEND strips.  Each rectangle
+    costs a few numpy calls on top of its pixels, so the band height and
+    each split are chosen by `_rects_cost`.
+    """
+    h = alpha.shape[0]
+    opaque, visible = alpha == 255, alpha > 0
+    plans = [_banded_rects(opaque, visible, -(-h // n)) for n in (1, 2, 4, 8) if h >= n]
+    return min(plans, key=_rects_cost)
+
+
+def _rects_cost(rects) -> float:
+    return sum(RECT_COST_PX + (r1 - r0) * (c1 - c0) * (COPY_COST if kind == COPY else 1)
+               for r0, r1, c0, c1, kind in rects)
+
+
+def _banded_rects(opaque: np.ndarray, visible: np.ndarray, band: int):
+    rects = []
+    for r0 in range(0, opaque.shape[0], band):
+        r1 = min(r0 + band, opaque.shape[0])
+        vis = np.flatnonzero(visible[r0:r1].any(0))
+        if not len(vis):
+            continue
+        v0, v1 = int(vis[0]), int(vis[-1]) + 1
+        whole = [(r0, r1, v0, v1, BLEND)]
+        core = np.r_[False, opaque[r0:r1, v0:v1].all(0), False].astype(np.int8)
+        edges = np.flatnonzero(np.diff(core))
+        if len(edges):
+            i = int(np.argmax(edges[1::2] - edges[::2]))
+            c0, c1 = v0 + int(edges[2 * i]), v0 + int(edges[2 * i + 1])
+            split = [r for r in ((r0, r1, v0, c0, BLEND), (r0, r1, c0, c1, COPY),
+                                 (r0, r1, c1, v1, BLEND)) if r[2] < r[3]]
+            if _rects_cost(split) < _rects_cost(whole):
+                whole = split
+        rects += whole
+
+    merged = []                          # join vertically adjacent equal rects
+    for r in rects:
+        m = merged[-1] if merged else None
+        if m and m[1] == r[0] and m[2:] == r[2:]:
+            merged[-1] = (m[0], r[1], *r[2:])
+        else:
+            merged.append(r)
+    return merged
+
+
 class Img:
     def __init__(self):
         self.img = None
@@ -12,7 +107,7 @@ class Img:
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
              keep_aspect: bool = False,
-             interpolation: int = cv2.INTER_AREA) -> "Img":
+             interpolation: int | None = None) -> "Img":
         """
         Load `path` into self.img and **optionally resize**.
 
@@ -26,8 +121,9 @@ class Img:
             • False  → resize exactly to `size`
             • True   → shrink so the *longer* side fits `size` while
                        preserving aspect ratio (no cropping).
-        interpolation : OpenCV flag
-            E.g.  `cv2.INTER_AREA` for shrink, `cv2.INTER_LINEAR` for enlarge.
+        interpolation : OpenCV flag | None
+            E.g.  `cv2.INTER_AREA` for shrink, `cv2.INTER_LINEAR` for enlarge;
+            None means `cv2.INTER_AREA`.
 
         Returns
         -------
@@ -49,6 +145,8 @@ class Img:
             else:
                 new_w, new_h = target_w, target_h
 
+            if interpolation is None:
+                interpolation = cv2.INTER_AREA
             self.img = cv2.resize(self.img, (new_w, new_h), interpolation=interpolation)
 
         return self
@@ -79,16 +177,129 @@ class Img:
         else:
             other_img.img[y:y + h, x:x + w] = self.img
 
+    def draw_batch(self, placements, sprites):
+        """
+        Composite many sprites onto this image in a single pass.
+
+        Parameters
+        ----------
+        placements : iterable of (sprite_id, x, y)
+            Upper-left pixel position of each sprite, drawn in order.
+        sprites : Mapping[sprite_id, Img]
+            The sprite images referenced by `placements`.
+
+        Unlike `draw_on`, sprites that stick out of the canvas are clipped
+        instead of rejected.  Each sprite is drawn from cached planes
+        trimmed to its visible box, as rectangles (see `_blend_planes`):
+        opaque ones are copied and only the rest is blended, on uint16
+        planes, all channels at once.
+        """
+        if self.img is None:
+            raise ValueError("Image not loaded.")
+
+        canvas = self.img
+        H, W = canvas.shape[:2]
+        channels = canvas.shape[2]
+        for sprite_id, x, y in placements:
+            colour, premul, inv_alpha, (ox, oy), rects = \
+                sprites[sprite_id]._blend_planes(channels)
+            x, y = x + ox, y + oy
+            h, w = colour.shape[:2]
+            if x >= 0 and y >= 0 and x + w <= W and y + h <= H and len(rects) == 1 \
+                    and rects[0][4] == COPY:        # opaque sprite, fully inside
+                canvas[y:y + h, x:x + w] = colour
+                continue
+
+            for r0, r1, c0, c1, kind in rects:
+                a, b = max(y + r0, 0), min(y + r1, H)
+                l, r = max(x + c0, 0), min(x + c1, W)
+                if a >= b or l >= r:
+                    continue
+                sy, sx = slice(a - y, b - y), slice(l - x, r - x)
+                roi = canvas[a:b, l:r]
+                if kind == COPY:
+                    roi[...] = colour[sy, sx]
+                    continue
+                acc = roi.astype(np.uint16)
+                np.multiply(acc, inv_alpha[sy, sx], out=acc)
+                acc += premul[sy, sx]
+                acc += 128                          # acc / 255, rounded
+                acc += acc >> 8
+                roi[...] = acc >> 8
+
+    def _blend_planes(self, channels: int):
+        """
+        Return (colour, premultiplied, inverse alpha, offset, rects) for
+        `draw_batch` onto a canvas with `channels` channels, built once per
+        channel count.
+
+        A BGRA sprite is first cropped to the bounding box of its non-zero
+        alpha; `offset` is the (x, y) of that box in the sprite.  `rects`
+        (see `_sprite_rects`) are the parts of the box to draw: COPY ones
+        straight from `colour`, BLEND ones through `premultiplied` (colour
+        times alpha) and `inverse alpha` (255 - alpha repeated per channel,
+        so the blend needs no broadcasting), both contiguous uint16.  On a
+        BGRA canvas the alpha channel is composited "over" as well.  A BGR
+        sprite is one COPY rect with no blend planes.
+        """
+        cached = getattr(self, "_planes", None)
+        if cached is None or cached[0] is not self.img:
+            if self.img is None:
+                raise ValueError("Image not loaded.")
+            cached = self._planes = (self.img, {})
+        planes = cached[1].get(channels)
+        if planes is not None:
+            return planes
+
+        img = self.img if self.img.ndim == 3 else cv2.cvtColor(self.img, cv2.COLOR_GRAY2BGR)
+        if img.shape[2] == 4:
+            visible = img[..., 3] > 0
+            rows, cols = np.flatnonzero(visible.any(1)), np.flatnonzero(visible.any(0))
+            if not len(rows):
+                rows = cols = np.zeros(1, np.intp)     # nothing visible
+            img = img[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+            offset = (int(cols[0]), int(rows[0]))
+            rects = _sprite_rects(img[..., 3])
+
+            alpha = img[..., 3:4].astype(np.uint16)
+            colour = np.ascontiguousarray(img if channels == 4 else img[..., :3])
+            premul = inv_alpha = None
+            if any(kind == BLEND for *_, kind in rects):
+                premul = np.ascontiguousarray(colour.astype(np.uint16) * alpha)
+                if channels == 4:       # "over": out alpha = a + dst alpha * (255 - a) / 255
+                    premul[..., 3] = 255 * alpha[..., 0]
+                inv_alpha = np.ascontiguousarray(np.repeat(255 - alpha, channels, axis=2))
+        else:
+            colour = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA) if channels == 4 else img
+            colour, premul, inv_alpha = np.ascontiguousarray(colour), None, None
+            offset, rects = (0, 0), [(0, colour.shape[0], 0, colour.shape[1], COPY)]
+
+        planes = cached[1][channels] = (colour, premul, inv_alpha, offset, rects)
+        return planes
+
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
+        """
+        Draw `txt` with its baseline starting at (x, y).
+
+        The string is rasterised once into an alpha sprite (see
+        `text_sprite`) and blitted through `draw_batch`, so HUD text that
+        is redrawn every frame costs a blend, not a `cv2.putText`.
+        """
         if self.img is None:
             raise ValueError("Image not loaded.")
-        cv2.putText(self.img, txt, (x, y),
-                    cv2.FONT_HERSHEY_SIMPLEX, font_size,
-                    color, thickness, cv2.LINE_AA)
+        sprite, dx, dy = text_sprite(txt, font_size, tuple(color), thickness)
+        self.draw_batch([(0, x - dx, y - dy)], {0: sprite})
 
-    def show(self):
+    def show(self, wait_ms: int = 0, title: str = "Image") -> int:
+        """
+        Display the image and wait up to `wait_ms` for a key (0 = until one
+        is pressed, then close the window).  Returns the key code or -1.
+        Game windows go through `FrameSink.WindowSink` instead.
+        """
         if self.img is None:
             raise ValueError("Image not loaded.")
-        cv2.imshow("Image", self.img)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+        cv2.imshow(title, self.img)
+        key = cv2.waitKey(wait_ms)
+        if wait_ms == 0:
+            cv2.destroyWindow(title)
+        return key
@@ -18,6 +18,9 @@ class MockImg(Img):
     def draw_on(self, other, x, y):
         MockImg.traj.append((x, y))
 
+    def draw_batch(self, placements, sprites):
+        MockImg.traj.extend((x, y) for _, x, y in placements)
+
     def put_text(self, txt, x, y, font_size, *_, **__):
         MockImg.txt_traj.append(((x, y), txt))
 
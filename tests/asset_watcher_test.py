@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from AssetWatcher import AssetWatcher
+from Board import Board
+from Command import Command
+from img import Img, cv2
+from PieceFactory import PieceFactory
+
+from .conftest import ROOT
+
+
+def _touch(path):
+    """Give `path` a newer mtime than the watcher has seen, however coarse the clock."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def _write_json(path, cfg):
+    path.write_text(json.dumps(cfg))
+    _touch(path)
+
+
+@pytest.fixture
+def pieces(tmp_path):
+    """A pieces/ copy with the white and black pawns only."""
+    for kind in ("PW", "PB"):
+        shutil.copytree(ROOT / "pieces" / kind, tmp_path / kind)
+    return tmp_path
+
+
+@pytest.fixture
+def factory(pieces):
+    board = Board(cell_H_pix=32, cell_W_pix=32, cell_H_m=1, cell_W_m=1,
+                  W_cells=8, H_cells=8, img=Img())
+    return PieceFactory(board, pieces)
+
+
+class TestAssetWatcher:
+    """Edits under pieces/ reach live pieces once the game applies them."""
+
+    def test_changed_sprite(self, factory, pieces):
+        piece = factory.create_piece("PW", (6, 0))
+        watcher = AssetWatcher(factory)
+        sprite = pieces / "PW" / "states" / "idle" / "sprites" / "1.png"
+        cv2.imwrite(str(sprite), np.full((64, 64, 3), (0, 0, 255), np.uint8))
+        _touch(sprite)
+
+        assert watcher.poll() == [sprite]
+        assert not np.all(piece._state._graphics.frames[0].img == (0, 0, 255))   # not yet applied
+        assert watcher.apply()
+        frame = piece._state._graphics.frames[0].img
+        assert frame.shape[:2] == (32, 32) and np.all(frame == (0, 0, 255))
+
+    def test_changed_speed_and_next_state(self, factory, pieces):
+        piece = factory.create_piece("PW", (6, 0))
+        piece.reset(0)
+        watcher = AssetWatcher(factory)
+        config = pieces / "PW" / "states" / "move" / "config.json"
+        cfg = json.loads(config.read_text())
+        cfg["physics"].update(speed_m_per_sec=2.0, next_state_when_finished="short_rest")
+        _write_json(config, cfg)
+        watcher.poll()
+        watcher.apply()
+
+        move = piece._state.transitions["Move"]
+        assert set(move.transitions) == {"short_rest"}
+        piece.on_command(Command(0, piece.piece_id, "Move", ["a2", "a3"]), 0)
+        assert piece._state is move and move._physics.speed == 2.0
+        piece.update(499)
+        assert piece.state_name == "move"
+        piece.update(500)
+        assert piece.state_name == "short_rest"
+
+    def test_malformed_file_is_retried_once_fixed(self, factory, pieces, caplog):
+        piece = factory.create_piece("PW", (6, 0))
+        watcher = AssetWatcher(factory)
+        config = pieces / "PW" / "states" / "move" / "config.json"
+        good = config.read_text()
+        config.write_text(good[:len(good) // 2])          # caught mid-save
+        _touch(config)
+
+        assert watcher.poll() == []
+        assert not watcher.apply()
+        assert "will retry" in caplog.text
+        assert watcher.poll() == []                        # still broken, still pending
+
+        cfg = json.loads(good)
+        cfg["physics"]["speed_m_per_sec"] = 4.0
+        _write_json(config, cfg)
+        assert watcher.poll() == [config]
+        watcher.apply()
+        move = piece._state.transitions["Move"]
+        assert move._physics.speed == 4.0
+        assert watcher.poll() == []
+
+    def test_unknown_next_state_is_rejected(self, factory, pieces, caplog):
+        piece = factory.create_piece("PW", (6, 0))
+        watcher = AssetWatcher(factory)
+        config = pieces / "PW" / "states" / "move" / "config.json"
+        cfg = json.loads(config.read_text())
+        cfg["physics"]["next_state_when_finished"] = "nap"
+        _write_json(config, cfg)
+
+        assert watcher.poll() == []
+        assert "unknown next_state_when_finished 'nap'" in caplog.text
+        assert piece._state.transitions["Move"]._physics.next_state == "long_rest"
+
+    def test_other_changes_survive_a_bad_file(self, factory, pieces):
+        watcher = AssetWatcher(factory)
+        (pieces / "PB" / "moves.txt").write_text("x,y\n")
+        _touch(pieces / "PB" / "moves.txt")
+        config = pieces / "PW" / "states" / "idle" / "config.json"
+        _write_json(config, json.loads(config.read_text()))
+        assert watcher.poll() == [config]
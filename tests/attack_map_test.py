@@ -0,0 +1,78 @@
+import random
+
+from AttackMap import AttackMap
+from Board import Board
+from FrameSink import NullSink
+from Game import Game
+from img import Img
+from Moves import Moves
+from PieceFactory import PieceFactory
+from SelfPlay import RandomAgent
+
+from .conftest import ROOT
+
+
+def _assert_same(incremental: AttackMap, pieces):
+    """`incremental` agrees with a map built from scratch for `pieces`."""
+    fresh = AttackMap(incremental.dims, pieces)
+    rows, cols = incremental.dims
+    for pid in pieces:
+        assert sorted(incremental.legal_moves(pid)) == sorted(fresh.legal_moves(pid)), pid
+    for r in range(rows):
+        for c in range(cols):
+            assert incremental.occupant((r, c)) == fresh.occupant((r, c)), (r, c)
+            for color in ("W", "B"):
+                assert incremental.attackers((r, c), color) == \
+                    fresh.attackers((r, c), color), (r, c, color)
+
+
+class TestAttackMap:
+    """The incrementally kept map always equals a freshly built one."""
+
+    def test_opening_position(self, make_game):
+        game = make_game()
+        am = game.attack_map
+        knight = am.occupant(game.board.to_cell("b1"))
+        assert sorted(am.legal_moves(knight)) == sorted(
+            [game.board.to_cell("a3"), game.board.to_cell("c3")])
+        assert am.legal_moves(am.occupant(game.board.to_cell("a1"))) == []
+        assert am.is_attacked(game.board.to_cell("e3"), "W")
+        assert not am.is_attacked(game.board.to_cell("e4"), "W")
+
+    def test_random_play(self, make_game):
+        for seed in range(3):
+            game, rng = make_game(tick_ms=50), random.Random(seed)
+            agents = [RandomAgent("W", rng), RandomAgent("B", rng)]
+            for now in range(0, 20_000, 50):
+                for agent in agents:
+                    cmd = agent.act(game, now)
+                    if cmd is not None:
+                        game.user_input_queue.put(cmd)
+                game.advance(now)
+                _assert_same(game.attack_map, game.pieces)
+                if game.result is not None:
+                    break
+
+    def test_stacked_pieces(self, make_game):
+        game = make_game()
+        am = game.attack_map
+        queen = game.pieces[am.occupant(game.board.to_cell("d1"))]
+        queen._state._physics.cell = game.board.to_cell("e2")      # onto its own pawn
+        am.sync(game.pieces)
+        _assert_same(am, game.pieces)
+        queen._state._physics.cell = game.board.to_cell("d1")
+        am.sync(game.pieces)
+        _assert_same(am, game.pieces)
+
+    def test_hot_reloaded_move_table(self, tmp_path):
+        board = Board(cell_H_pix=64, cell_W_pix=64, cell_H_m=1, cell_W_m=1,
+                      W_cells=8, H_cells=8, img=Img())
+        factory = PieceFactory(board, ROOT / "pieces")
+        game = Game(factory.create_board_pieces(ROOT / "pieces" / "board.csv"), board,
+                    sink=NullSink())
+        (tmp_path / "moves.txt").write_text("-1,0\n")
+        factory._swap_moves("NW", Moves(tmp_path / "moves.txt", (8, 8)))()
+        game.attack_map.sync(game.pieces)
+        knight = game.attack_map.occupant(board.to_cell("b1"))
+        assert game.attack_map.legal_moves(knight) == []          # b2 holds a pawn
+        _assert_same(game.attack_map, game.pieces)
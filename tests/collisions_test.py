@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from Collisions import Path, contacts, sweep
+from Command import Command
+from SelfPlay import RandomAgent
+
+
+def _record(make_game, seed, duration_ms):
+    """Commands two random agents issue over `duration_ms` of a 10 ms game."""
+    game, rng = make_game(), random.Random(seed)
+    agents = [RandomAgent("W", rng, think_ms=1000), RandomAgent("B", rng, think_ms=1000)]
+    stream = []
+    for now in range(0, duration_ms, 10):
+        for agent in agents:
+            cmd = agent.act(game, now)
+            if cmd is not None:
+                game.user_input_queue.put(cmd)
+                stream.append((cmd.timestamp, cmd.piece_id, cmd.type, list(cmd.params)))
+        game.advance(now)
+    return stream
+
+
+class TestContacts:
+    """Contact times come from the segments, not from how a step is split."""
+
+    def test_diagonal_mover_grazes_orthogonal_neighbours(self):
+        mover = Path((4, 0), [(0, (4, 0), 1414, (3, 1))])
+        for cell in ((3, 0), (4, 1)):
+            assert contacts(mover, Path(cell), 0, 2000) == []
+
+    def test_head_on_contact_time(self):
+        a = Path((0, 0), [(0, (0, 0), 4000, (4, 0))])
+        b = Path((4, 0), [(1000, (4, 0), 3000, (2, 0))])
+        # a at t/1000, b at 4 - (t - 1000)/1000: 0.5 apart at t = 2250
+        assert contacts(a, b, 0, 4000) == [pytest.approx(2250, abs=1e-3)]
+
+    @pytest.mark.parametrize("step", [1, 7, 50, 333, 1000])
+    def test_same_contacts_at_any_split(self, step):
+        a = Path((0, 0), [(0, (0, 0), 2000, (2, 1)), (2500, (2, 1), 3500, (2, 3))])
+        b = Path((2, 2))
+        whole = contacts(a, b, 0, 4000)
+        split = [t for s in range(0, 4000, step) for t in contacts(a, b, s, min(s + step, 4000))]
+        assert split == whole and len(whole) == 1
+
+    def test_pieces_already_touching_do_not_start_touching(self):
+        a = Path((3, 3), [(1000, (3, 3), 2000, (3, 5))])
+        assert sweep({"a": a, "b": Path((3, 3))}, 1000, 2000) == []
+
+
+class TestStepSize:
+    """One command stream gives one game at every tick size."""
+
+    def test_replays_agree(self, make_game):
+        stream = _record(make_game, seed=0, duration_ms=30_000)
+        results = {}
+        for tick_ms in (10, 50, 200, 500, 1000):
+            game = make_game(tick_ms=tick_ms)
+            for cmd in stream:
+                game.user_input_queue.put(Command(*cmd))
+            game.advance(30_000)
+            results[tick_ms] = game.captures, game.state_hash()
+        assert results[10][0]
+        assert all(r == results[10] for r in results.values())
+
+    def test_defender_judged_by_state_at_contact(self, make_game):
+        game = make_game()
+        paths = {"NW_0": Path((5, 3), [(0, (5, 3), 2000, (3, 3))]), "PB_0": Path((3, 3))}
+        # PB_0 jumped at 0, landed and started resting at 1000
+        statuses = {"NW_0": [(0, True, True)], "PB_0": [(0, False, True), (1000, True, False)]}
+        assert game._contact_outcome("NW_0", "PB_0", 800, paths, statuses) == ("PB_0", "NW_0")
+        assert game._contact_outcome("NW_0", "PB_0", 1200, paths, statuses) == ("NW_0", "PB_0")
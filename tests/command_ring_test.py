@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from Command import Command
+from CommandRing import CommandRing
+
+
+def _cmds(n, start=0):
+    return [Command(start + i, f"P{i % 5}W_{i % 3}", "Move", ["e2", "e4"]) for i in range(n)]
+
+
+class TestCommandRing:
+    """Bounded SPSC ring: order, wrap-around and overflow policies."""
+
+    def test_capacity_must_be_a_power_of_two(self):
+        with pytest.raises(ValueError):
+            CommandRing(capacity=6)
+
+    def test_unknown_overflow_policy(self):
+        with pytest.raises(ValueError):
+            CommandRing(overflow="grow")
+
+    def test_fifo_across_wrap_around(self):
+        ring = CommandRing(capacity=8)
+        sent, got = [], []
+        for burst in range(10):                 # 10 * 5 records through 8 slots
+            cmds = _cmds(5, start=burst * 5)
+            for cmd in cmds:
+                assert ring.put(cmd)
+            sent += cmds
+            got += ring.drain(max_n=3) if burst % 2 else ring.drain()
+        got += ring.drain()
+        assert got == sent
+        assert ring.empty()
+
+    def test_wrapped_drain_records_in_order(self):
+        ring = CommandRing(capacity=4)
+        for cmd in _cmds(3):
+            ring.put(cmd)
+        ring.drain()
+        for cmd in _cmds(4, start=100):         # slots 3, 0, 1, 2
+            ring.put(cmd)
+        assert ring.drain_records()["timestamp"].tolist() == [100, 101, 102, 103]
+
+    def test_drop_policy_refuses_when_full(self):
+        ring = CommandRing(capacity=4, overflow="drop")
+        results = [ring.put(cmd) for cmd in _cmds(6)]
+        assert results == [True] * 4 + [False] * 2
+        assert ring.dropped == 2
+        assert len(ring) == 4
+        assert [c.timestamp for c in ring.drain()] == [0, 1, 2, 3]
+
+    def test_block_policy_waits_for_the_consumer(self):
+        ring = CommandRing(capacity=4, overflow="block")
+        got, done = [], threading.Event()
+
+        def consume():
+            while not done.is_set() or not ring.empty():
+                got.extend(ring.drain())
+                time.sleep(0.001)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        cmds = _cmds(100)
+        for cmd in cmds:
+            assert ring.put(cmd)
+        done.set()
+        consumer.join(timeout=5)
+        assert got == cmds
+        assert ring.dropped == 0
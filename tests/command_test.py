@@ -0,0 +1,55 @@
+import pytest
+
+from Command import Command, NO_SQUARE, RECORD_STRUCT, square_code, square_name
+
+
+class TestCommand:
+    """Slotted, interned Command: same fields as before, byte encoding."""
+
+    def test_fields(self):
+        cmd = Command(1234, "QW_0", "Move", ["d1", "d4"])
+        assert (cmd.timestamp, cmd.piece_id, cmd.type, cmd.params) == \
+            (1234, "QW_0", "Move", ["d1", "d4"])
+
+    def test_fields_are_writable(self):
+        cmd = Command(0, "KB_0", "Move", ["e8", "e7"])
+        cmd.piece_id, cmd.type, cmd.params = "KW_0", "Jump", ["e1"]
+        assert (cmd.piece_id, cmd.type, cmd.params) == ("KW_0", "Jump", ["e1"])
+        assert Command.from_bytes(cmd.to_bytes()) == cmd
+
+    @pytest.mark.parametrize("params", [["e2", "e4"], ["a1"], [], ["p15", "a1"]])
+    def test_byte_round_trip(self, params):
+        cmd = Command(2 ** 40 + 7, "NB_1", "Move", params)
+        data = cmd.to_bytes()
+        assert len(data) == RECORD_STRUCT.size
+        back = Command.from_bytes(data)
+        assert back == cmd
+        assert (back.timestamp, back.piece_id, back.type, back.params) == \
+            (cmd.timestamp, cmd.piece_id, cmd.type, params)
+
+    def test_from_bytes_at_offset(self):
+        cmds = [Command(i, "PW_0", "Move", ["a2", "a3"]) for i in range(3)]
+        buf = b"".join(c.to_bytes() for c in cmds)
+        assert [Command.from_bytes(buf, i * RECORD_STRUCT.size) for i in range(3)] == cmds
+
+    def test_single_param_is_the_destination(self):
+        assert Command(0, "PW_0", "Jump", ["c3"]).squares() == (NO_SQUARE, square_code("c3"))
+
+    def test_too_many_params(self):
+        with pytest.raises(ValueError):
+            Command(0, "PW_0", "Move", ["a2", "a3", "a4"]).to_bytes()
+
+    @pytest.mark.parametrize("square", ["a1", "h8", "p15", "e2"])
+    def test_square_code_round_trip(self, square):
+        assert square_name(square_code(square)) == square
+
+    @pytest.mark.parametrize("square", ["q1", "a16", "a0"])
+    def test_square_out_of_range(self, square):
+        with pytest.raises(ValueError):
+            square_code(square)
+
+    def test_equality_and_repr(self):
+        a = Command(5, "RW_0", "Move", ["a1", "a4"])
+        assert a == Command(5, "RW_0", "Move", ["a1", "a4"])
+        assert a != Command(6, "RW_0", "Move", ["a1", "a4"])
+        assert repr(a) == "Command(timestamp=5, piece_id='RW_0', type='Move', params=['a1', 'a4'])"
@@ -0,0 +1,30 @@
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# the game modules import each other by bare name
+sys.path.insert(0, str(ROOT / "It1_interfaces"))
+
+
+@pytest.fixture
+def make_game():
+    """Headless standard game: `make_game(tick_ms=10, **game_kwargs)`."""
+    from Board import Board
+    from FrameSink import NullSink
+    from Game import Game
+    from img import Img
+    from PieceFactory import PieceFactory
+
+    def make(tick_ms=10, **kwargs):
+        board = Board(cell_H_pix=64, cell_W_pix=64, cell_H_m=1, cell_W_m=1,
+                      W_cells=8, H_cells=8, img=Img())
+        factory = PieceFactory(board, ROOT / "pieces")
+        game = Game(factory.create_board_pieces(ROOT / "pieces" / "board.csv"), board,
+                    tick_ms=tick_ms, sink=NullSink(), **kwargs)
+        for p in game.pieces.values():
+            p.reset(0)
+        return game
+    return make
@@ -0,0 +1,65 @@
+import gc
+
+import numpy as np
+
+from Command import Command
+from img import Img
+from Piece import (COOLDOWN_BGRA, COOLDOWN_LEVELS, _with_cooldown, clear_shaded,
+                   cooldown_overlay, shaded_sprites)
+
+
+def _sprite(value=200):
+    img = Img()
+    img.img = np.full((32, 32, 3), value, np.uint8)
+    return img
+
+
+class TestCooldownOverlay:
+    """Shades are built once per (size, level) and per (sprite, level)."""
+
+    def test_overlay_built_once(self):
+        a = cooldown_overlay(32, 32, 4)
+        assert cooldown_overlay(32, 32, 4) is a
+        assert cooldown_overlay(32, 32, 5) is not a
+        rows = (a.img[..., 3] > 0).any(1)
+        assert rows[:8].all() and not rows[8:].any()        # 4/16 of 32 rows
+        assert tuple(a.img[0, 0]) == COOLDOWN_BGRA
+
+    def test_shaded_sprite_reused(self):
+        clear_shaded()
+        sprite = _sprite()
+        assert _with_cooldown(sprite, 0) is sprite
+        shaded = _with_cooldown(sprite, COOLDOWN_LEVELS)
+        assert _with_cooldown(sprite, COOLDOWN_LEVELS) is shaded
+        assert _with_cooldown(sprite, 3) is not shaded
+        assert len(shaded_sprites()) == 2
+        assert (sprite.img == 200).all()                     # original untouched
+        alpha = COOLDOWN_BGRA[3] / 255
+        assert abs(int(shaded.img[31, 0, 0]) - round(200 * (1 - alpha) + 40 * alpha)) <= 1
+
+    def test_cache_follows_the_sprite(self):
+        clear_shaded()
+        sprite = _sprite()
+        _with_cooldown(sprite, 2)
+        assert len(shaded_sprites()) == 1
+        del sprite
+        gc.collect()
+        assert shaded_sprites() == []
+
+    def test_resting_piece_reuses_its_shade(self, make_game):
+        clear_shaded()
+        game = make_game()
+        game.user_input_queue.put(Command(0, "PW_4", "Move", ["e2", "e4"]))
+        game.advance(2100)
+        pawn = game.pieces["PW_4"]
+        assert pawn.state_name == "long_rest"
+        physics = pawn._state._physics
+        _, level, _, _ = pawn.view_at(game.sim_ms)
+        assert 0 < level <= COOLDOWN_LEVELS
+
+        changes = pawn.next_frame_ms(game.sim_ms)
+        sprite, _, _ = pawn.sprite_at(game.sim_ms)
+        assert pawn.sprite_at(changes - 1)[0] is sprite
+        assert pawn.view_at(changes)[1] == level - 1
+        assert pawn.sprite_at(physics.start_ms + physics.duration_ms)[0] is \
+            pawn._state._graphics.frames[pawn.view_at(physics.start_ms + physics.duration_ms)[0]]
@@ -0,0 +1,46 @@
+import numpy as np
+
+from Command import Command
+from Game import INPUT_POLL_MS
+
+
+def _drawable(game):
+    game.board.img.img = np.zeros((512, 512, 3), np.uint8)
+    return game
+
+
+class TestWaitMs:
+    """The window waits until the next redraw or tick, never past INPUT_POLL_MS."""
+
+    def test_clamped_to_poll_interval(self, make_game):
+        game = make_game(tick_ms=0)
+        game._redraw_at = float("inf")
+        assert game._wait_ms(1000) == INPUT_POLL_MS
+        game._redraw_at = 1004
+        assert game._wait_ms(1000) == 4
+        game._redraw_at = 990                              # overdue: still pump events
+        assert game._wait_ms(1000) == 1
+
+    def test_next_tick_is_a_deadline(self, make_game):
+        game = make_game(tick_ms=4)
+        game.advance(100)
+        game._redraw_at = float("inf")
+        assert game._wait_ms(game.sim_ms) == 4
+        assert game._wait_ms(game.sim_ms + 3) == 1
+        game._redraw_at = game.sim_ms + 2
+        assert game._wait_ms(game.sim_ms) == 2
+
+    def test_follows_the_pieces_after_a_draw(self, make_game):
+        game = _drawable(make_game(tick_ms=0))
+        game.step(0)
+        game._draw(0)
+        due = min(t for t in (p.next_frame_ms(0) for p in game.pieces.values())
+                  if t is not None)
+        assert game._redraw_at == due
+        assert game._wait_ms(0) == int(min(max(due, 1), INPUT_POLL_MS))
+
+        game.user_input_queue.put(Command(0, "PW_4", "Move", ["e2", "e4"]))
+        game.step(50)
+        game._draw(50)
+        assert game._redraw_at == 50                       # a moving piece redraws every pass
+        assert game._wait_ms(50) == 1
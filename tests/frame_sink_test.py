@@ -0,0 +1,125 @@
+import io
+import threading
+
+import numpy as np
+import pytest
+
+import FrameSink
+from FrameSink import NullSink, StreamSink, WindowSink, read_frames
+from img import Img
+from Material import EndRules
+
+
+def _frames(n, h=40, w=56):
+    """`n` BGRA frames, each changing a different small patch of the last."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+    out = []
+    for i in range(n):
+        frame = frame.copy()
+        frame[(i * 7) % h:(i * 7) % h + 5, (i * 11) % w:(i * 11) % w + 6] = rng.integers(0, 256, 4)
+        img = Img()
+        img.img = frame
+        out.append(img)
+    return out
+
+
+def _stream(frames, **kwargs):
+    buf = io.BytesIO()
+    sink = StreamSink(buf.write, codec="png", backlog=len(frames) + 1, **kwargs)
+    for img in frames:
+        assert sink.show(img)
+    sink.close()
+    return sink, buf.getvalue()
+
+
+class TestStreamSink:
+    """Frames written by `StreamSink` come back out of `read_frames` (lossless with png)."""
+
+    @pytest.mark.parametrize("tile", [None, 16])
+    def test_round_trip(self, tile):
+        frames = _frames(12)
+        sink, data = _stream(frames, tile=tile, keyframe_every=5)
+        got = [p.copy() for p in read_frames(io.BytesIO(data).read)]
+        assert len(got) == len(frames) == sink.stats["frames"]
+        for img, picture in zip(frames, got):
+            assert np.array_equal(picture, img.img[..., :3])
+        assert sink.stats["bytes"] == len(data) and sink.stats["dropped"] == 0
+
+    def test_tiles_are_smaller_than_keyframes(self):
+        frames = _frames(10)
+        _, whole = _stream(frames)
+        _, tiled = _stream(frames, tile=16, keyframe_every=100)
+        assert len(tiled) < len(whole) / 2
+
+    def test_same_frame_is_not_sent_twice(self):
+        img = _frames(1)[0]
+        buf = io.BytesIO()
+        sink = StreamSink(buf.write, codec="png")
+        sink.show(img)
+        sink.show(img)
+        sink.close()
+        assert sink.stats["frames"] == 1
+
+    def test_slow_writer_drops_oldest(self):
+        release = threading.Event()
+        written = []
+
+        def write(msg):
+            release.wait()
+            written.append(msg)
+
+        frames = _frames(8)
+        sink = StreamSink(write, codec="png", backlog=2)
+        for img in frames:
+            sink.show(img)
+        release.set()
+        sink.close()
+        assert sink.stats["dropped"] > 0
+        assert sink.stats["frames"] + sink.stats["dropped"] == len(frames)
+        assert len(written) == sink.stats["frames"]
+
+
+class _FakeCv2:
+    WND_PROP_VISIBLE = 4
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.append((name, *args))
+            return -1 if name == "waitKey" else 1
+        return record
+
+
+class TestWindowSink:
+    """Only the window the sink showed is destroyed, and only once."""
+
+    @pytest.fixture
+    def cv(self, monkeypatch):
+        fake = _FakeCv2()
+        monkeypatch.setattr(FrameSink, "cv2", fake)
+        return fake
+
+    def test_close_without_show(self, cv):
+        WindowSink("unused").close()
+        assert cv.calls == []
+
+    def test_close_after_show(self, cv):
+        sink = WindowSink("board")
+        assert sink.show(_frames(1)[0])
+        sink.close()
+        sink.close()
+        destroyed = [c for c in cv.calls if c[0].startswith("destroy")]
+        assert destroyed == [("destroyWindow", "board")]
+
+
+class TestNullSink:
+    def test_headless_run(self, make_game):
+        game = make_game(rules=EndRules(time_limit_ms=200))
+        game.board.img.img = np.zeros((8 * 64, 8 * 64, 3), np.uint8)
+        assert NullSink().show(Img())
+        game.run()
+        assert game.result == (None, "time limit")
+        assert game.frame is not None and game.sim_ms >= 200
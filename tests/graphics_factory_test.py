@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from GraphicsFactory import GraphicsFactory
+from img import cv2
+
+
+@pytest.fixture
+def sprite(tmp_path):
+    """A 256x256 sprite file: left half dark, right half bright."""
+    img = np.zeros((256, 256, 3), np.uint8)
+    img[:, 128:] = 200
+    path = tmp_path / "sprites" / "1.png"
+    path.parent.mkdir()
+    cv2.imwrite(str(path), img)
+    return path
+
+
+def _levels(gf, path):
+    return [level.img.shape[:2] for level in gf._mips[path]]
+
+
+class TestMipChain:
+    """Frames come from the smallest big-enough level; unneeded levels are dropped."""
+
+    def test_only_the_levels_needed_are_kept(self, sprite):
+        gf = GraphicsFactory()
+        frame = gf.get_frame(sprite, (32, 32))
+        assert frame.img.shape == (32, 32, 3)
+        assert _levels(gf, sprite) == [(32, 32)]            # the full decode is gone
+        assert gf.get_frame(sprite, (20, 24)).img.shape == (24, 20, 3)
+
+    def test_smaller_sizes_never_touch_the_disk(self, sprite):
+        gf = GraphicsFactory()
+        gf.get_frame(sprite, (64, 64))
+        sprite.unlink()
+        for size in ((16, 16), (48, 40), (64, 64), (8, 8)):
+            frame = gf.get_frame(sprite, size)
+            assert frame.img.shape[:2] == size[::-1]
+            assert frame.img[0, 0, 0] < 50 and frame.img[0, -1, 0] > 150
+        assert _levels(gf, sprite)[0] == (64, 64)
+
+    def test_a_larger_size_decodes_again(self, sprite):
+        gf = GraphicsFactory()
+        gf.get_frame(sprite, (32, 32))
+        assert gf.get_frame(sprite, (100, 100)).img.shape == (100, 100, 3)
+        assert _levels(gf, sprite)[0] == (128, 128)
+        sprite.unlink()
+        with pytest.raises(FileNotFoundError):
+            gf.get_frame(sprite, (200, 200))
+
+    def test_exact_level_is_shared_not_copied(self, sprite):
+        gf = GraphicsFactory()
+        frame = gf.get_frame(sprite, (64, 64))
+        assert frame.img is gf._mips[sprite][0].img
+
+
+class TestScaledCache:
+    """Scaled frames live in an LRU of `max_cached` entries."""
+
+    def test_lru_eviction(self, sprite):
+        gf = GraphicsFactory(max_cached=3)
+        a = gf.get_frame(sprite, (10, 10))
+        gf.get_frame(sprite, (20, 20))
+        gf.get_frame(sprite, (30, 30))
+        assert gf.get_frame(sprite, (10, 10)) is a          # hit; now most recent
+        gf.get_frame(sprite, (40, 40))
+        assert [k[1] for k in gf._scaled] == [(30, 30), (10, 10), (40, 40)]
+
+    def test_evict_one_file(self, sprite, tmp_path):
+        other = tmp_path / "sprites" / "2.png"
+        cv2.imwrite(str(other), np.zeros((16, 16, 3), np.uint8))
+        gf = GraphicsFactory()
+        gf.get_frame(sprite, (16, 16))
+        kept = gf.get_frame(other, (16, 16))
+        gf.evict(sprite)
+        assert sprite not in gf._mips and {k[0] for k in gf._scaled} == {other}
+        assert gf.get_frame(other, (16, 16)) is kept
+
+    def test_reload_reads_the_new_file(self, sprite):
+        gf = GraphicsFactory()
+        old = gf.get_frame(sprite, (16, 16))
+        cv2.imwrite(str(sprite), np.full((64, 64, 3), 90, np.uint8))
+        paths, frames = gf.reload(sprite.parent, (16, 16))
+        assert paths == [sprite] and frames[0] is not old
+        assert (frames[0].img == 90).all()
+
+    def test_trim_keeps_frames_on_screen(self, sprite):
+        gf = GraphicsFactory()
+        shown = gf.get_frame(sprite, (16, 16))
+        gf.get_frame(sprite, (24, 24))
+        assert gf.trim(keep=[shown]) == 2               # one mip level, one scaled frame
+        assert not gf._mips and list(gf._scaled.values()) == [shown]
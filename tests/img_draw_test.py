@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from img import BLEND, COPY, Img, _sprite_rects
+
+
+def _sprite(h=24, w=20, seed=0):
+    """BGRA sprite: transparent border, soft left and right edges, opaque core."""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+    alpha = np.zeros((h, w), np.uint8)
+    alpha[3:h - 2, 2:w - 4] = rng.integers(1, 255, (h - 5, w - 6))
+    alpha[3:h - 2, 5:w - 8] = 255
+    img[..., 3] = alpha
+    out = Img()
+    out.img = img
+    return out
+
+
+def _canvas(channels, h=40, w=48, seed=1):
+    out = Img()
+    out.img = np.random.default_rng(seed).integers(0, 256, (h, w, channels), dtype=np.uint8)
+    return out
+
+
+def _reference(canvas, sprite, x, y):
+    """Float "over" compositing of `sprite` at (x, y), clipped to `canvas`."""
+    out = canvas.astype(np.float64)
+    H, W = out.shape[:2]
+    h, w = sprite.shape[:2]
+    a, b, l, r = max(y, 0), min(y + h, H), max(x, 0), min(x + w, W)
+    if a >= b or l >= r:
+        return canvas.copy()
+    src = sprite[a - y:b - y, l - x:r - x].astype(np.float64)
+    alpha = src[..., 3:4] / 255
+    dst = out[a:b, l:r]
+    dst[..., :3] = src[..., :3] * alpha + dst[..., :3] * (1 - alpha)
+    if out.shape[2] == 4:
+        dst[..., 3:] = 255 * alpha + dst[..., 3:] * (1 - alpha)
+    return np.round(out)
+
+
+POSITIONS = [(10, 8), (-7, 5), (5, -9), (38, 4), (6, 30), (-5, -5), (40, 32), (100, 0)]
+
+
+class TestDrawBatch:
+    """`draw_batch` matches a float reference blend, pixel for pixel (±1)."""
+
+    @pytest.mark.parametrize("channels", [3, 4])
+    @pytest.mark.parametrize("x, y", POSITIONS)
+    def test_matches_reference(self, channels, x, y):
+        canvas, sprite = _canvas(channels), _sprite()
+        expected = _reference(canvas.img, sprite.img, x, y)
+        canvas.draw_batch([(0, x, y)], {0: sprite})
+        assert np.abs(canvas.img.astype(int) - expected).max() <= 1
+
+    @pytest.mark.parametrize("channels", [3, 4])
+    def test_many_sprites_in_order(self, channels):
+        canvas, sprites = _canvas(channels), {i: _sprite(seed=i) for i in range(3)}
+        placements = [(0, 4, 4), (1, 12, 10), (2, -3, 20), (0, 30, 25)]
+        expected = canvas.img
+        for i, x, y in placements:
+            expected = _reference(expected, sprites[i].img, x, y).astype(np.uint8)
+        canvas.draw_batch(placements, sprites)
+        assert np.abs(canvas.img.astype(int) - expected).max() <= 2   # rounding compounds
+
+    @pytest.mark.parametrize("channels", [3, 4])
+    @pytest.mark.parametrize("x, y", [(20, 30), (-90, 40), (100, -120), (200, 250)])
+    def test_copy_core_matches_reference(self, channels, x, y):
+        canvas, sprite = _canvas(channels, 300, 320), _sprite(256, 240)
+        assert COPY in {kind for *_, kind in sprite._blend_planes(channels)[4]}
+        expected = _reference(canvas.img, sprite.img, x, y)
+        canvas.draw_batch([(0, x, y)], {0: sprite})
+        assert np.abs(canvas.img.astype(int) - expected).max() <= 1
+
+    def test_half_alpha_over_opaque_is_opaque(self):
+        canvas, sprite = Img(), Img()
+        canvas.img = np.full((4, 4, 4), (10, 20, 30, 255), np.uint8)
+        sprite.img = np.full((2, 2, 4), (200, 200, 200, 128), np.uint8)
+        canvas.draw_batch([(0, 1, 1)], {0: sprite})
+        assert (canvas.img[1:3, 1:3, 3] == 255).all()
+        assert (canvas.img[0, 0] == (10, 20, 30, 255)).all()
+
+    def test_bgr_sprite_on_bgra_canvas_is_copied_opaque(self):
+        canvas, sprite = _canvas(4), Img()
+        sprite.img = np.full((5, 6, 3), (1, 2, 3), np.uint8)
+        canvas.draw_batch([(0, -2, 37)], {0: sprite})
+        assert (canvas.img[37:40, 0:4] == (1, 2, 3, 255)).all()
+
+    def test_trimmed_planes_and_offset(self):
+        sprite = _sprite()
+        colour, premul, inv_alpha, offset, rects = sprite._blend_planes(4)
+        assert offset == (2, 3)
+        assert colour.shape[:2] == (24 - 5, 20 - 6)
+        assert premul.shape == inv_alpha.shape == colour.shape
+        assert sprite._blend_planes(4)[0] is colour            # built once per channel count
+
+    def test_rects_split_copy_and_blend(self):
+        alpha = _sprite(256, 240).img[3:-2, 2:-4, 3]
+        rects = _sprite_rects(alpha)
+        covered = np.zeros(alpha.shape, int)
+        for r0, r1, c0, c1, kind in rects:
+            covered[r0:r1, c0:c1] += 1
+            if kind == COPY:
+                assert (alpha[r0:r1, c0:c1] == 255).all()
+        assert (covered <= 1).all()
+        assert (covered[alpha > 0] == 1).all()
+        assert {kind for *_, kind in rects} == {COPY, BLEND}
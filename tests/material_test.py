@@ -0,0 +1,72 @@
+from Material import EndRules, Material
+
+
+class TestMaterial:
+    """Per-colour counts kept up to date by captures."""
+
+    def test_counts(self):
+        m = Material(["KW_0", "PW_0", "PW_1", "KB_0"])
+        assert m.colors == ("B", "W")
+        assert (m.count("W"), m.count("W", "P"), m.count("B", "K")) == (3, 2, 1)
+        m.remove("PW_0")
+        assert m.count("W") == 2 and m.leader() == "W"
+        m.remove("PW_1")
+        assert m.leader() is None
+
+    def test_snapshot_restore(self):
+        m = Material(["KW_0", "KB_0", "PB_0"])
+        snap = m.snapshot()
+        m.remove("KW_0")
+        m.restore(snap)
+        assert m.count("W", "K") == 1 and m.lost("W", EndRules()) is None
+
+    def test_side_without_king_never_loses_one(self):
+        m = Material(["RW_0", "KB_0"])
+        assert m.lost("W", EndRules()) is None
+
+
+class TestEndRules:
+    """`Game` settles `result` as captures happen, and on the time limit."""
+
+    def test_king_capture(self, make_game):
+        game = make_game()
+        game._capture("QW_0", "KB_0", 500)
+        assert game.result == ("W", "king captured")
+        assert game._is_win()
+
+    def test_king_capture_off(self, make_game):
+        game = make_game(rules=EndRules(king_capture=False))
+        game._capture("QW_0", "KB_0", 500)
+        assert game.result is None
+
+    def test_min_pieces(self, make_game):
+        game = make_game(rules=EndRules(king_capture=False, min_pieces=15))
+        game._capture("QB_0", "PW_0", 100)
+        assert game.result is None                      # 15 left
+        game._capture("QB_0", "PW_1", 200)
+        assert game.result == ("B", "too few pieces")
+
+    def test_both_sides_losing_at_once_is_a_draw(self, make_game):
+        game = make_game(rules=EndRules(min_pieces=16))
+        game.material.remove("PW_0")                   # counted, not yet checked
+        game._capture("QW_0", "PB_0", 100)
+        assert game.result == (None, "too few pieces")
+
+    def test_time_limit_leader_wins(self, make_game):
+        game = make_game(rules=EndRules(time_limit_ms=1000))
+        game._capture("QB_0", "PW_0", 100)
+        game.advance(990)
+        assert not game._is_win()
+        game.advance(1000)
+        assert game._is_win() and game.result == ("B", "time limit")
+
+    def test_time_limit_draw(self, make_game):
+        game = make_game(rules=EndRules(time_limit_ms=1000))
+        game.advance(1000)
+        assert game._is_win() and game.result == (None, "time limit")
+
+    def test_first_result_stands(self, make_game):
+        game = make_game()
+        game._capture("QW_0", "KB_0", 500)
+        game._capture("QB_0", "KW_0", 600)
+        assert game.result == ("W", "king captured")
@@ -0,0 +1,86 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from Board import Board
+from Command import Command
+from FrameSink import NullSink
+from Game import Game
+from img import Img
+from Memory import SUBSYSTEMS, MemoryBudget, deep_bytes, usage
+from Piece import shaded_sprites
+from PieceFactory import PieceFactory
+
+from .conftest import ROOT
+
+
+@pytest.fixture
+def played():
+    """A drawn 8x8 game with a piece resting (shaded) and a latency sample; and its GraphicsFactory."""
+    board = Board(cell_H_pix=32, cell_W_pix=32, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8,
+                  img=Img())
+    board.img.img = np.zeros((256, 256, 3), np.uint8)
+    factory = PieceFactory(board, ROOT / "pieces")
+    game = Game(factory.create_board_pieces(ROOT / "pieces" / "board.csv"), board,
+                tick_ms=10, sink=NullSink())
+    for p in game.pieces.values():
+        p.reset(0)
+    game.user_input_queue.put(Command(0, "PW_4", "Move", ["e2", "e4"]))
+    game.advance(2500)
+    game._draw(game.sim_ms)
+    assert game.pieces["PW_4"].state_name == "long_rest"
+    return game, factory.graphics_factory
+
+
+class TestUsage:
+    def test_every_subsystem_counted(self, played):
+        game, gf = played
+        u = usage(game, gf)
+        assert set(u) == set(SUBSYSTEMS) and all(v > 0 for v in u.values())
+
+    def test_shared_buffers_counted_once(self):
+        a = np.zeros(1000, np.uint8)
+        seen = {}
+        assert deep_bytes([a, a[10:], a.reshape(10, 100)], seen) >= 1000
+        assert deep_bytes(a, seen) == 0
+
+    def test_deque_contents_counted(self):
+        assert deep_bytes(deque([np.zeros(1000, np.uint8)]), {}) >= 1000
+
+
+class TestMemoryBudget:
+    """Over the limit, caches go cheapest-to-rebuild first; rollback state never goes."""
+
+    def test_under_the_limit_nothing_is_trimmed(self, played):
+        game, gf = played
+        budget = MemoryBudget(10 ** 12, gf)
+        budget.enforce(game, game.sim_ms)
+        assert budget.trims == 0 and gf._mips and shaded_sprites()
+
+    def test_sprite_cache_goes_first(self, played):
+        game, gf = played
+        total = sum(usage(game, gf).values())
+        budget = MemoryBudget(total - 1, gf)
+        after = budget.enforce(game, game.sim_ms)
+        assert budget.trims == 1 and sum(after.values()) <= total - 1
+        assert not gf._mips
+        assert shaded_sprites() and game.input_latency
+
+    def test_everything_trimmable_goes_under_a_tiny_limit(self, played):
+        game, gf = played
+        history, captures = len(game._history), list(game.captures)
+        budget = MemoryBudget(1, gf)
+        budget.enforce(game, game.sim_ms)
+        assert budget.trims == 3
+        assert not gf._mips and not shaded_sprites() and not game.input_latency
+        assert len(game._history) == history and game.captures == captures
+        game._draw(game.sim_ms)                          # shades are rebuilt on demand
+        assert shaded_sprites()
+
+    def test_checks_are_rate_limited(self, played):
+        game, gf = played
+        budget = MemoryBudget(1, gf, check_every_ms=1000)
+        assert budget.enforce(game, 0) is not None
+        assert budget.enforce(game, 999) is None
+        assert budget.enforce(game, 1000) is not None
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from img import Img, cv2
+from Recorder import Recorder
+
+
+def _frame(value, channels=4):
+    img = Img()
+    img.img = np.full((48, 64, channels), value, np.uint8)
+    return img
+
+
+def _read_back(path):
+    cap, frames = cv2.VideoCapture(str(path)), []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            return frames
+        frames.append(frame)
+
+
+class TestRecorder:
+    """Every push ends up as one video frame, written or standing in for a drop."""
+
+    @pytest.mark.parametrize("slots", [1, 2, 64])
+    def test_written_plus_dropped(self, tmp_path, slots):
+        path, n = tmp_path / "game.mp4", 40
+        rec = Recorder(path, (64, 48), fps=30, slots=slots)
+        results = [rec.push(_frame(4 * i)) for i in range(n)]
+        stats = rec.close()
+
+        assert results[0] and stats["pushed"] == sum(results)
+        assert stats["pushed"] + stats["dropped"] == n
+        assert stats["written"] == n
+        assert len(_read_back(path)) == n
+
+    def test_frames_in_order(self, tmp_path):
+        path = tmp_path / "game.mp4"
+        rec = Recorder(path, (64, 48), fps=30, slots=32)
+        for i in range(20):
+            rec.push(_frame(10 * i, channels=3))
+        assert rec.close()["dropped"] == 0
+        levels = [int(np.median(f)) for f in _read_back(path)]
+        assert levels == pytest.approx([10 * i for i in range(20)], abs=4)
+
+    def test_frames_are_resized_to_the_video(self, tmp_path):
+        path = tmp_path / "game.mp4"
+        rec = Recorder(path, (64, 48), slots=4)
+        big = Img()
+        big.img = np.full((96, 128, 4), 200, np.uint8)
+        rec.push(big)
+        rec.close()
+        (frame,) = _read_back(path)
+        assert frame.shape == (48, 64, 3)
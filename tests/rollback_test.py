@@ -0,0 +1,45 @@
+from Command import Command
+
+
+def _cmd(game, ts, src, dst):
+    cell = game.board.to_cell(src)
+    pid = next(pid for pid, p in game.pieces.items() if p.cell == cell)
+    return Command(ts, pid, "Move", [src, dst])
+
+
+class TestRollback:
+    """A command that arrives late lands where it would have on time."""
+
+    def _play(self, game, late_by):
+        """Two pawn moves at 100 and 150 ms, the second delivered `late_by` ms late."""
+        first, second = _cmd(game, 100, "e2", "e4"), _cmd(game, 150, "d7", "d5")
+        for now in range(0, 3000, 10):
+            if now == 100:
+                game.user_input_queue.put(first)
+            if now == 150 + late_by:
+                game.user_input_queue.put(second)
+            game.advance(now)
+        return game
+
+    def test_late_and_on_time_delivery_agree(self, make_game):
+        on_time = self._play(make_game(), late_by=0)
+        late = self._play(make_game(), late_by=120)
+        assert late.rollback_stats["rollbacks"] == 1
+        assert late.state_hash() == on_time.state_hash()
+
+    def test_replayed_commands_counted_once(self, make_game):
+        game = self._play(make_game(), late_by=120)
+        assert game.rollback_stats["rollbacks"] == 1
+        assert game.input_stats["accepted"] == 2
+        assert len(game.input_latency) == 2
+
+    def test_too_late_counted_once(self, make_game):
+        game = make_game(rollback_ms=100)
+        game.advance(1000)
+        cmd = _cmd(game, 500, "e2", "e4")
+        game.user_input_queue.put(cmd)
+        for now in (1001, 1002, 1005, 1010, 1015):     # only 1010 runs a tick
+            game.advance(now)
+        assert game.rollback_stats == {"rollbacks": 0, "resimulated_ticks": 0, "too_late": 1}
+        assert game.input_stats["accepted"] == 1
+        assert game.pieces[cmd.piece_id].state_name == "move"
@@ -0,0 +1,49 @@
+import numpy as np
+
+import SelfPlay
+from Command import COMMAND_TYPES, square_code
+from SelfPlay import COMMAND, POSITION, STATE_NAMES, ShardWriter, load_shards
+
+
+class TestShards:
+    """Rows go out as numbered, fixed-dtype .npy shards and map back in order."""
+
+    def test_writer_splits_at_rows_per_shard(self, tmp_path):
+        writer = ShardWriter(tmp_path, "positions-00000000", POSITION, rows_per_shard=3)
+        for t in range(7):
+            writer.append((1, t * 100, t, 0, t, 7 - t, 0))
+        assert len(list(tmp_path.iterdir())) == 2          # the last row is still buffered
+        writer.flush()
+        writer.flush()                                     # nothing left, no empty shard
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            f"positions-00000000-{i:05d}.npy" for i in range(3)]
+        shards = load_shards(tmp_path, "positions")
+        assert [len(s) for s in shards] == [3, 3, 1]
+        assert all(isinstance(s, np.memmap) and s.dtype == POSITION for s in shards)
+        rows = np.concatenate(shards)
+        assert rows["t_ms"].tolist() == [t * 100 for t in range(7)]
+        assert rows["col"].tolist() == [7 - t for t in range(7)]
+        assert load_shards(tmp_path, "commands") == []
+
+    def test_played_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SelfPlay, "_assets", None)
+        monkeypatch.setattr(SelfPlay, "_factory", None)
+        assert SelfPlay._play_chunk((tmp_path, 4, 2, 1000, 20, 500, 1 << 10)) == 2
+
+        positions = np.concatenate(load_shards(tmp_path, "positions"))
+        assert positions.dtype == POSITION
+        assert sorted(set(positions["game"].tolist())) == [4, 5]
+        assert set(positions["t_ms"].tolist()) == {0, 500, 1000}
+        start = positions[(positions["game"] == 4) & (positions["t_ms"] == 0)]
+        assert len(start) == 32 and set(start["row"].tolist()) == {0, 1, 6, 7}
+
+        commands = np.concatenate(load_shards(tmp_path, "commands"))
+        assert commands.dtype == COMMAND and len(commands)
+        opening = commands[(commands["game"] == 4) & (commands["t_ms"] == 0)]
+        busy = start["state"] != STATE_NAMES.index("idle")
+        assert sorted(start["piece"][busy].tolist()) == sorted(opening["piece"].tolist())
+        assert set(commands["type"].tolist()) == {COMMAND_TYPES.code("Move")}
+        first = commands[commands["game"] == 4][0]
+        moved = start[start["piece"] == first["piece"]][0]
+        assert first["src"] == square_code("abcdefgh"[moved["col"]] + str(8 - moved["row"]))
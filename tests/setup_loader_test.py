@@ -0,0 +1,88 @@
+import pytest
+
+from Board import Board
+from img import Img
+from PieceFactory import PieceFactory
+from SetupLoader import (InvalidSetup, clear_cache, compile_moves, load_board, load_moves,
+                         parse_board, parse_moves)
+
+from .conftest import ROOT
+
+
+class TestParseMoves:
+    """moves.txt: `dr,dc[:tag]` per line."""
+
+    def test_offsets_and_tags(self):
+        offsets, tags = parse_moves("# pawn\n-1,0:non_capture\n\n-2,0:1st\n-1,1:capture\n-1,1:capture\n")
+        assert offsets == [(-1, 0), (-2, 0), (-1, 1)]
+        assert tags == {(-1, 0): "non_capture", (-2, 0): "1st", (-1, 1): "capture"}
+
+    @pytest.mark.parametrize("text, message", [
+        ("1,0\n1;2\n", "moves.txt:2: expected 'dr,dc[:tag]', got '1;2'"),
+        ("1\n", "moves.txt:1: expected 'dr,dc[:tag]', got '1'"),
+        ("0,0\n", "moves.txt:1: offset 0,0 is not a move"),
+        ("1,0:fly\n", "moves.txt:1: unknown tag 'fly'"),
+        ("1,0\n2,0\n1,0:capture\n", "moves.txt:3: offset 1,0 listed with another tag"),
+    ])
+    def test_errors(self, text, message):
+        with pytest.raises(InvalidSetup) as err:
+            parse_moves(text)
+        assert str(err.value).startswith(message)
+
+    def test_error_names_the_source(self):
+        with pytest.raises(InvalidSetup, match=r"^pieces/QW/moves.txt:1: "):
+            parse_moves("x,y\n", "pieces/QW/moves.txt")
+
+    def test_rays_stop_at_the_board_edge(self):
+        offsets, tags = parse_moves("1,0\n2,0\n0,1\n")
+        compiled = compile_moves(offsets, tags, (3, 3))
+        assert compiled.rays[0][2] == ((((1, 2), ""), ((2, 2), "")),)
+        assert compiled.legal[2][2] == frozenset()
+
+
+class TestParseBoard:
+    """board.csv: one row per board row, cells empty or a piece type."""
+
+    def test_placements(self):
+        board = parse_board("RB,,NB\n,,\nPW,,\n")
+        assert board.dims == (3, 3)
+        assert board.placements.tolist() == [("RB", 0, 0), ("NB", 0, 2), ("PW", 2, 0)]
+
+    @pytest.mark.parametrize("text, known, message", [
+        ("", None, "board.csv: empty board"),
+        ("RB,NB\nPW\n", None, "board.csv:2: 1 columns, expected 2"),
+        ("RB,XX\n", {"RB"}, "board.csv:1: unknown piece 'XX' in column 2"),
+    ])
+    def test_errors(self, text, known, message):
+        with pytest.raises(InvalidSetup) as err:
+            parse_board(text, known=known)
+        assert str(err.value) == message
+
+
+class TestCache:
+    """Files with the same content are parsed once."""
+
+    def test_same_content_shares_the_compiled_form(self, tmp_path):
+        clear_cache()
+        a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+        a.write_text("1,0\n")
+        b.write_text("1,0\n")
+        assert load_moves(a, (8, 8)) is load_moves(b, (8, 8))
+        assert load_moves(a, (8, 8)) is not load_moves(a, (4, 4))
+
+    def test_board_errors_name_the_file(self, tmp_path):
+        path = tmp_path / "board.csv"
+        path.write_text("RB,ZZ\n")
+        with pytest.raises(InvalidSetup, match=r"board.csv:1: unknown piece 'ZZ'"):
+            load_board(path, known={"RB"})
+
+
+class TestCreateBoardPieces:
+    """A setup is only placed on a board of its own size."""
+
+    def test_size_mismatch(self):
+        board = Board(cell_H_pix=32, cell_W_pix=32, cell_H_m=1, cell_W_m=1,
+                      W_cells=10, H_cells=8, img=Img())
+        factory = PieceFactory(board, ROOT / "pieces")
+        with pytest.raises(InvalidSetup, match=r"board.csv: setup is 8x8 cells, board is 8x10"):
+            factory.create_board_pieces(ROOT / "pieces" / "board.csv")
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+import SelfPlay
+from img import Img
+from SharedAssets import SharedAssets
+
+
+def _img(shape, value):
+    img = Img()
+    img.img = np.full(shape, value, np.uint8)
+    return img
+
+
+@pytest.fixture
+def published():
+    board = _img((16, 16, 3), 9)
+    sprites = {"gray": _img((5, 7), 50), "bgr": _img((4, 4, 3), 60),
+               "bgra": _img((3, 5, 4), 70)}
+    assets = SharedAssets.publish(board, sprites, channels=3)
+    yield assets
+    assets.close()
+
+
+class TestSharedAssets:
+    """Workers attach to the parent's block and see the same pixels, read-only."""
+
+    def test_attach_maps_every_image(self, published):
+        worker = SharedAssets.attach(published.manifest)
+        try:
+            assert set(worker.sprites) == {"gray", "bgr", "bgra"}
+            assert (worker.board.img == 9).all() and worker.board.img.shape == (16, 16, 3)
+            for key, value in (("gray", 50), ("bgr", 60), ("bgra", 70)):
+                arr = worker.sprites[key].img
+                assert arr.shape[2] == 3 and (arr == value).all()
+                assert not arr.flags.writeable
+                assert arr.ctypes.data % 64 == 0
+            with pytest.raises(ValueError):
+                worker.board.img[0, 0] = 0
+        finally:
+            worker.close()
+
+    def test_views_share_one_block(self, published):
+        worker = SharedAssets.attach(published.manifest)
+        offset = published.manifest["images"]["bgr"][0]
+        published._shm.buf[offset] = 123                   # parent writes, worker sees it
+        assert worker.sprites["bgr"].img[0, 0, 0] == 123
+        worker.close()
+        assert worker.sprites == {} and worker.board is None
+        assert (published.sprites["gray"].img == 50).all()  # a worker leaving keeps the block
+
+    def test_owner_close_frees_the_block(self):
+        assets = SharedAssets.publish(None, {"a": _img((2, 2, 3), 1)})
+        manifest = assets.manifest
+        assert "__board__" not in manifest["images"]
+        assets.close()
+        with pytest.raises(FileNotFoundError):
+            SharedAssets.attach(manifest)
+
+    def test_worker_factory_adopts_shared_sprites(self, monkeypatch):
+        assets = SelfPlay._publish_assets()
+        worker = SharedAssets.attach(assets.manifest)
+        try:
+            monkeypatch.setattr(SelfPlay, "_assets", worker)
+            monkeypatch.setattr(SelfPlay, "_factory", None)
+            factory = SelfPlay._worker_factory()
+            assert SelfPlay._worker_factory() is factory
+            assert factory.board.img is worker.board
+            pieces = factory.create_board_pieces(SelfPlay.ROOT / "pieces" / "board.csv")
+            frame = pieces[0]._state._graphics.frames[0]
+            assert any(frame is img for img in worker.sprites.values())
+            assert frame.img.shape[2] == worker.board.img.shape[2]
+        finally:
+            worker.close()
+            assets.close()
@@ -0,0 +1,85 @@
+import numpy as np
+
+from Command import Command
+from Spectator import DELTA, HEADER, KEYFRAME, SpectatorClient, SpectatorFeed
+
+from .conftest import ROOT
+
+
+def _client(game):
+    return SpectatorClient(game.board, ROOT / "pieces")
+
+
+def _play(game, feed, until_ms=3000):
+    """Move two pieces and stream every 50 ms step; yields the messages sent."""
+    game.user_input_queue.put(Command(100, "PW_4", "Move", ["e2", "e4"]))
+    game.user_input_queue.put(Command(300, "NB_1", "Move", ["g8", "f6"]))
+    for now in range(0, until_ms, 50):
+        game.advance(now)
+        msg = feed.tick(game.pieces, now)
+        if msg is not None:
+            yield now, msg
+
+
+def _kind(msg):
+    return HEADER.unpack_from(msg)[1]
+
+
+class TestSpectatorFeed:
+    """A client rebuilds the piece views from a keyframe and the deltas after it."""
+
+    def test_round_trip(self, make_game):
+        game, feed = make_game(), SpectatorFeed(keyframe_every=1000)
+        client = _client(game)
+        feed.subscribe(client.feed)
+        for now, _ in _play(game, feed):
+            assert client.now_ms == now
+            assert np.array_equal(client.views, feed._prev)
+        assert client.pieces == list(game.pieces)
+        assert client.cell_of("PW_4") == game.board.to_cell("e4")
+        # the first keyframe, then one per state name first seen ("move", "long_rest")
+        assert feed._states == ["idle", "move", "long_rest"]
+        assert feed.stats["keyframes"] == 3 and feed.stats["deltas"] > 0
+
+    def test_bytes_in_any_split(self, make_game):
+        game, feed = make_game(), SpectatorFeed(keyframe_every=5)
+        stream = b"".join(msg for _, msg in _play(game, feed))
+        client = _client(game)
+        for i in range(0, len(stream), 7):
+            client.feed(stream[i:i + 7])
+        assert np.array_equal(client.views, feed._prev)
+
+    def test_joining_mid_stream_waits_for_a_keyframe(self, make_game):
+        game, feed = make_game(), SpectatorFeed(keyframe_every=4)
+        messages = [msg for _, msg in _play(game, feed)]
+        client = _client(game)
+        first_key = next(i for i, m in enumerate(messages[1:], 1) if _kind(m) == KEYFRAME)
+        assert all(_kind(m) == DELTA for m in messages[1:first_key])
+        for msg in messages[1:first_key]:
+            client.apply(msg)
+            assert client.views is None
+        for msg in messages[first_key:]:
+            client.apply(msg)
+        assert np.array_equal(client.views, feed._prev)
+
+    def test_late_subscriber_gets_the_backlog(self, make_game):
+        game, feed = make_game(), SpectatorFeed(keyframe_every=1000)
+        plays = _play(game, feed)
+        for _ in range(3):
+            next(plays)
+        client = _client(game)
+        feed.subscribe(client.feed)
+        assert np.array_equal(client.views, feed._prev)
+        for _ in plays:
+            pass
+        assert np.array_equal(client.views, feed._prev)
+
+    def test_roster_change_sends_a_keyframe(self, make_game):
+        game, feed = make_game(), SpectatorFeed(keyframe_every=1000)
+        feed.tick(game.pieces, 0)
+        del game.pieces["PW_0"]
+        msg = feed.tick(game.pieces, 10)
+        assert _kind(msg) == KEYFRAME
+        client = _client(game)
+        client.apply(msg)
+        assert "PW_0" not in client.pieces and len(client.views) == len(game.pieces)
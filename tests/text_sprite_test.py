@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import img
+from img import Img, text_sprite
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(img, "_text_cache", img.OrderedDict())
+    monkeypatch.setattr(img, "TEXT_CACHE_SIZE", 3)
+    return img._text_cache
+
+
+class TestTextSprite:
+    """Rendered strings are kept in a small LRU keyed by text and style."""
+
+    def test_same_key_renders_once(self, cache):
+        sprite, dx, dy = text_sprite("12:34", 0.5, (255, 255, 255, 255), 1)
+        assert text_sprite("12:34", 0.5, (255, 255, 255, 255), 1)[0] is sprite
+        assert text_sprite("12:34", 0.5, (0, 0, 255, 255), 1)[0] is not sprite
+        assert sprite.img.shape[2] == 4 and sprite.img[..., 3].any()
+        assert dx == 2 and 0 < dy < sprite.img.shape[0]
+
+    def test_least_recently_used_goes_first(self, cache):
+        for txt in "abc":
+            text_sprite(txt, 0.5, (255, 255, 255), 1)
+        a = text_sprite("a", 0.5, (255, 255, 255), 1)        # a is now the newest
+        text_sprite("d", 0.5, (255, 255, 255), 1)
+        assert [k[0] for k in cache] == ["c", "a", "d"]
+        assert text_sprite("a", 0.5, (255, 255, 255), 1)[0] is a[0]
+
+    def test_opacity_scales_alpha(self, cache):
+        solid = text_sprite("x", 1.0, (10, 20, 30, 255), 2)[0].img
+        faint = text_sprite("x", 1.0, (10, 20, 30, 51), 2)[0].img
+        assert (solid[..., :3] == (10, 20, 30)).all()
+        assert faint[..., 3].max() == solid[..., 3].max() // 5
+
+    def test_put_text_draws_at_baseline(self, cache):
+        canvas = Img()
+        canvas.img = np.zeros((60, 200, 3), np.uint8)
+        canvas.put_text("Score", 10, 40, 0.8, (0, 255, 0, 255), 2)
+        ys, xs = np.nonzero(canvas.img[..., 1])
+        assert ys.max() <= 40 + 8 and ys.min() >= 10 and xs.min() >= 8
+        assert not canvas.img[..., [0, 2]].any()
+        canvas.put_text("Score", 10, 40, 0.8, (0, 255, 0, 255), 2)
+        assert len(cache) == 1
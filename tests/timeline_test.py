@@ -0,0 +1,52 @@
+import pytest
+
+from Graphics import Timeline
+
+
+class TestTimeline:
+    """Frame index and next switch as pure functions of elapsed ms."""
+
+    def test_starts(self):
+        assert Timeline(4, 10, loop=True).starts == [0, 100, 200, 300]
+        assert Timeline(3, 6, loop=True).starts == [0, 167, 333]
+
+    @pytest.mark.parametrize("elapsed, frame", [
+        (-5, 0), (0, 0), (99, 0), (100, 1), (399, 3), (400, 0), (1450, 2)])
+    def test_frame_at_loop(self, elapsed, frame):
+        assert Timeline(4, 10, loop=True).frame_at(elapsed) == frame
+
+    @pytest.mark.parametrize("elapsed, frame", [(0, 0), (250, 2), (400, 3), (10_000, 3)])
+    def test_frame_at_once(self, elapsed, frame):
+        assert Timeline(4, 10, loop=False).frame_at(elapsed) == frame
+
+    @pytest.mark.parametrize("elapsed, change", [
+        (-5, 0), (0, 100), (150, 200), (300, 400), (399, 400), (400, 500), (1250, 1300)])
+    def test_next_change_loop(self, elapsed, change):
+        assert Timeline(4, 10, loop=True).next_change(elapsed) == change
+
+    def test_next_change_once_ends(self):
+        t = Timeline(4, 10, loop=False)
+        assert t.next_change(250) == 300
+        assert t.next_change(300) is None
+
+    def test_next_change_is_when_frame_at_changes(self):
+        t = Timeline(5, 7, loop=True)
+        elapsed = 0
+        for _ in range(20):
+            change = t.next_change(elapsed)
+            assert t.frame_at(change - 1) == t.frame_at(elapsed)
+            assert t.frame_at(change) != t.frame_at(elapsed)
+            elapsed = change
+
+    @pytest.mark.parametrize("fps", [0, -1])
+    def test_still_when_fps_not_positive(self, fps):
+        t = Timeline(5, fps, loop=True)
+        assert t.n_frames == 1
+        assert t.frame_at(1000) == 0
+        assert t.next_change(0) is None
+
+    @pytest.mark.parametrize("n", [0, 1])
+    def test_single_or_no_frame(self, n):
+        t = Timeline(n, 10, loop=True)
+        assert t.frame_at(1000) == 0
+        assert t.next_change(0) is None
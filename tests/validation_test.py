@@ -0,0 +1,61 @@
+from collections import Counter
+import random
+
+import pytest
+
+from Command import Command
+
+
+def _piece_at(game, square):
+    cell = game.board.to_cell(square)
+    return next(pid for pid, p in game.pieces.items() if p.cell == cell)
+
+
+class TestValidate:
+    """Commands are checked against the board before the state machine."""
+
+    @pytest.mark.parametrize("src, dst", [
+        ("e2", "d3"),   # pawn capture diagonal onto an empty square
+        ("a1", "a5"),   # rook through its own pawn
+        ("a1", "b1"),   # rook onto its own knight
+    ])
+    def test_rejects_illegal_moves(self, make_game, src, dst):
+        game = make_game()
+        assert not game._validate(Command(1, _piece_at(game, src), "Move", [src, dst]))
+
+    @pytest.mark.parametrize("src, dst", [("e2", "e4"), ("e2", "e3"), ("b1", "c3")])
+    def test_accepts_legal_moves(self, make_game, src, dst):
+        game = make_game()
+        assert game._validate(Command(1, _piece_at(game, src), "Move", [src, dst]))
+
+    def test_double_step_only_from_the_starting_cell(self, make_game):
+        game = make_game()
+        pawn = _piece_at(game, "e2")
+        game.user_input_queue.put(Command(0, pawn, "Move", ["e2", "e3"]))
+        game.advance(5000)
+        assert game.pieces[pawn].cell == game.board.to_cell("e3")
+        assert game._validate(Command(5001, pawn, "Move", ["e3", "e4"]))
+        assert not game._validate(Command(5001, pawn, "Move", ["e3", "e5"]))
+
+    def test_one_friendly_piece_per_target(self, make_game):
+        game = make_game()
+        game.user_input_queue.put(Command(1, _piece_at(game, "b1"), "Move", ["b1", "c3"]))
+        game.user_input_queue.put(Command(1, _piece_at(game, "d2"), "Move", ["d2", "c3"]))
+        game.advance(10)
+        assert game.input_stats["accepted"] == 1
+        assert game.input_stats["rejected"] == 1
+
+    def test_random_play_never_stacks_friendly_pieces(self, make_game):
+        game, rng = make_game(), random.Random(1)
+        for now in range(0, 30_000, 20):
+            for pid, p in list(game.pieces.items()):
+                moves = p._state._moves.get_moves(*p.cell)
+                if moves and rng.random() < 0.01:
+                    dst = game.board.to_square(rng.choice(moves))
+                    game.user_input_queue.put(
+                        Command(now, pid, "Move", [game.board.to_square(p.cell), dst]))
+            game.advance(now)
+            resting = Counter(p.cell for p in game.pieces.values() if p.path() is None)
+            assert max(resting.values()) == 1
+            if game.result is not None:
+                break